@@ -1,24 +1,70 @@
 import logging
 import asyncio
-from typing import Dict, List, Set
+import time
+from collections import Counter, deque
+from typing import Deque, Dict, List, Set
 from datetime import datetime
 from aiogram import Bot
-from aiogram.exceptions import TelegramAPIError
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramForbiddenError,
+    TelegramNotFound,
+    TelegramRetryAfter,
+)
 
 from .user_manager import UserManager
 
+
+class TokenBucket:
+    """Simple async token bucket: allows `rate` acquisitions per `period` seconds."""
+
+    def __init__(self, rate: int, period: float):
+        self.rate = rate
+        self.period = period
+        self._allowance = float(rate)
+        self._last_check = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Block until a token is available, then consume it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._allowance = min(
+                    float(self.rate),
+                    self._allowance + (now - self._last_check) * (self.rate / self.period)
+                )
+                self._last_check = now
+
+                if self._allowance >= 1.0:
+                    self._allowance -= 1.0
+                    return
+
+                # Wait just long enough for the next token to refill
+                await asyncio.sleep((1.0 - self._allowance) * (self.period / self.rate))
+
+
 class BroadcastManager:
     """Manages broadcasting messages to all users and groups."""
-    
+
+    # Number of concurrent broadcast worker tasks
+    WORKER_COUNT = 20
+
     def __init__(self, bot: Bot, user_manager: UserManager, owner_id: int):
         self.bot = bot
         self.user_manager = user_manager
         self.owner_id = owner_id
         self.logger = logging.getLogger(__name__)
         
-        # Broadcast statistics
+        # Rate limiting sized to Telegram's documented 30 messages/sec
+        # overall. The 20/min-per-group limit never binds for broadcasts —
+        # each group receives exactly one message per run — so there is no
+        # group bucket here; TelegramRetryAfter handling covers the rest.
+        self.global_bucket = TokenBucket(30, 1.0)
+
+        # Broadcast statistics — bounded ring buffer, keeps only the last 50
         self.last_broadcast = None
-        self.broadcast_history: List[Dict] = []
+        self.broadcast_history: Deque[Dict] = deque(maxlen=50)
         
         self.logger.info("BroadcastManager initialized")
     
@@ -36,10 +82,13 @@ class BroadcastManager:
         try:
             self.logger.info(f"Starting broadcast to {target_type}: {message[:50]}...")
             
-            # Get target chats
-            targets = await self._get_broadcast_targets(target_type)
-            
-            if not targets:
+            # Prepare message with broadcast header
+            broadcast_message = self._prepare_broadcast_message(message)
+
+            # Send to all matching chats with rate limiting
+            results = await self._send_to_targets(target_type, broadcast_message)
+
+            if results["total_targets"] == 0:
                 self.logger.warning("No targets found for broadcast")
                 return {
                     "success": 0,
@@ -49,12 +98,6 @@ class BroadcastManager:
                     "message": "No targets found"
                 }
             
-            # Prepare message with broadcast header
-            broadcast_message = self._prepare_broadcast_message(message)
-            
-            # Send to all targets with rate limiting
-            results = await self._send_to_targets(targets, broadcast_message)
-            
             # Update statistics
             broadcast_record = {
                 "timestamp": datetime.now().isoformat(),
@@ -65,11 +108,7 @@ class BroadcastManager:
             
             self.broadcast_history.append(broadcast_record)
             self.last_broadcast = datetime.now()
-            
-            # Keep only last 50 broadcasts in memory
-            if len(self.broadcast_history) > 50:
-                self.broadcast_history = self.broadcast_history[-50:]
-            
+
             self.logger.info(f"Broadcast completed: {results}")
             return results
             
@@ -83,100 +122,103 @@ class BroadcastManager:
                 "error": str(e)
             }
     
-    async def _get_broadcast_targets(self, target_type: str) -> List[Dict]:
-        """Get list of chat IDs to broadcast to."""
-        try:
-            all_chats = await self.user_manager.get_all_chats()
-            targets = []
-            
-            for chat_data in all_chats:
-                chat_id = chat_data.get("chat_id")
-                chat_type = chat_data.get("chat_type", "private")
-                
-                if not chat_id:
-                    continue
-                
-                # Filter based on target type
-                if target_type == "users" and chat_type != "private":
-                    continue
-                elif target_type == "groups" and chat_type == "private":
-                    continue
-                
-                targets.append({
-                    "chat_id": chat_id,
-                    "chat_type": chat_type,
-                    "title": chat_data.get("title", "Private Chat")
-                })
-            
-            return targets
-            
-        except Exception as e:
-            self.logger.error(f"Error getting broadcast targets: {e}")
-            return []
-    
     def _prepare_broadcast_message(self, message: str) -> str:
         """Prepare the broadcast message with appropriate formatting."""
         # Return message as-is to make it look like a normal bot message
         return message
     
-    async def _send_to_targets(self, targets: List[Dict], message: str) -> Dict:
-        """Send message to all targets with proper rate limiting."""
-        success_count = 0
-        failed_count = 0
-        user_count = 0
-        group_count = 0
-        
-        # Rate limiting for responsible API usage
-        semaphore = asyncio.Semaphore(20)
-        
-        async def send_to_chat(target: Dict):
-            nonlocal success_count, failed_count, user_count, group_count
-            
-            # Rate limiting for API protection
-            async with semaphore:
+    async def _send_to_targets(self, target_type: str, message: str) -> Dict:
+        """Send message to all matching chats using a bounded pool of worker tasks."""
+        counters: Counter = Counter()
+
+        # Fixed worker pool instead of one task per target — keeps task count
+        # O(workers) even for very large broadcasts. Targets are streamed
+        # straight from UserManager with filtering pushed down, so no
+        # intermediate list is materialized.
+        queue: asyncio.Queue = asyncio.Queue()
+        total_targets = 0
+        async for chat_id, chat_type in self.user_manager.iter_chats(target_type):
+            queue.put_nowait({"chat_id": chat_id, "chat_type": chat_type})
+            total_targets += 1
+
+        # Unreachable chats are collected here and evicted in one batched
+        # write after the fan-out, so failures don't stall the send loop
+        pending_removals: List[int] = []
+
+        async def worker():
+            while True:
+                try:
+                    target = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+
                 try:
                     chat_id = target["chat_id"]
                     chat_type = target["chat_type"]
-                    
-                    await self.bot.send_message(
-                        chat_id=chat_id,
-                        text=message,
-                        parse_mode="HTML"
-                    )
-                    
-                    success_count += 1
+
+                    # Block only when Telegram's quota is actually exhausted
+                    await self.global_bucket.acquire()
+
+                    # parse_mode comes from the Bot-wide HTML default
+                    await self.bot.send_message(chat_id=chat_id, text=message)
+
+                    counters["success"] += 1
                     if chat_type == "private":
-                        user_count += 1
+                        counters["users"] += 1
+                    else:
+                        counters["groups"] += 1
+
+                    # Lazy %-format — this line runs per recipient and is
+                    # normally filtered out at INFO level
+                    self.logger.debug("Broadcast sent to %s (%s)", chat_id, chat_type)
+
+                except TelegramRetryAfter as e:
+                    # Flood control: wait as instructed and retry instead of
+                    # counting the chat as failed
+                    retries = target.get("retries", 0)
+                    if retries < 3:
+                        self.logger.warning(
+                            f"Flood control for {target['chat_id']}: retry in {e.retry_after}s"
+                        )
+                        await asyncio.sleep(e.retry_after)
+                        target["retries"] = retries + 1
+                        queue.put_nowait(target)
                     else:
-                        group_count += 1
-                    
-                    self.logger.debug(f"Broadcast sent to {chat_id} ({chat_type})")
-                    
-                    # Small delay to prevent API flooding
-                    await asyncio.sleep(0.05)
-                    
+                        counters["failed"] += 1
+                        self.logger.warning(f"Giving up on {target['chat_id']} after {retries} retries")
+
+                except (TelegramForbiddenError, TelegramNotFound) as e:
+                    # Bot was blocked or the chat no longer exists
+                    counters["failed"] += 1
+                    self.logger.warning(f"Removing unreachable chat {target['chat_id']}: {e}")
+                    pending_removals.append(target["chat_id"])
+
                 except TelegramAPIError as e:
-                    failed_count += 1
+                    counters["failed"] += 1
                     self.logger.warning(f"Failed to send broadcast to {target['chat_id']}: {e}")
-                    
-                    # Remove inactive chats
-                    if "bot was blocked" in str(e).lower() or "chat not found" in str(e).lower():
-                        await self.user_manager.remove_chat(target["chat_id"])
-                        
+
                 except Exception as e:
-                    failed_count += 1
+                    counters["failed"] += 1
                     self.logger.error(f"Unexpected error sending to {target['chat_id']}: {e}")
-        
-        # Execute all sends concurrently
-        tasks = [send_to_chat(target) for target in targets]
-        await asyncio.gather(*tasks, return_exceptions=True)
-        
+                finally:
+                    queue.task_done()
+
+        # Structured concurrency — cheaper than gather's wrapper future and
+        # cancels the remaining workers if one raises unexpectedly
+        worker_count = min(self.WORKER_COUNT, total_targets)
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(worker_count):
+                tg.create_task(worker())
+
+        if pending_removals:
+            await self.user_manager.remove_chats(pending_removals)
+
         return {
-            "success": success_count,
-            "failed": failed_count,
-            "total_users": user_count,
-            "total_groups": group_count,
-            "total_targets": len(targets)
+            "success": counters["success"],
+            "failed": counters["failed"],
+            "total_users": counters["users"],
+            "total_groups": counters["groups"],
+            "total_targets": total_targets
         }
     
     async def send_owner_notification(self, message: str):
@@ -184,8 +226,7 @@ class BroadcastManager:
         try:
             await self.bot.send_message(
                 chat_id=self.owner_id,
-                text=f"🔔 <b>Bot Notification</b>\n\n{message}",
-                parse_mode="HTML"
+                text=f"🔔 <b>Bot Notification</b>\n\n{message}"
             )
             self.logger.info("Owner notification sent")
             
@@ -214,7 +255,7 @@ class BroadcastManager:
             "total_broadcasts": total_broadcasts,
             "last_broadcast": self.last_broadcast.isoformat() if self.last_broadcast else None,
             "average_success_rate": round(avg_success_rate, 2),
-            "recent_broadcasts": self.broadcast_history[-5:] if self.broadcast_history else []
+            "recent_broadcasts": list(self.broadcast_history)[-5:] if self.broadcast_history else []
         }
     
     async def test_broadcast(self) -> bool:
@@ -224,8 +265,7 @@ class BroadcastManager:
             
             await self.bot.send_message(
                 chat_id=self.owner_id,
-                text=test_message,
-                parse_mode="HTML"
+                text=test_message
             )
             
             self.logger.info("Broadcast test successful")
@@ -1,8 +1,12 @@
 import logging
 import asyncio
+import heapq
+import time
 import unicodedata
+from collections import deque
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional, Tuple
 
 from .gemini_client import GeminiClient
 from .personality import PersonalityManager
@@ -13,9 +17,13 @@ from config.settings import Settings
 def detect_language_and_tone(text: str) -> Tuple[str, str]:
     if not text or not text.strip():
         return "en", "casual"
+    # Chat traffic repeats heavily ("ok", "lol", "gm", "kya haal") — the
+    # detection below is pure, so cache it keyed on the stripped text
+    return _detect_cached(text.strip())
 
-    text_stripped = text.strip()
 
+@lru_cache(maxsize=4096)
+def _detect_cached(text_stripped: str) -> Tuple[str, str]:
     # Step 1: Unicode script detection (catches Hindi script, Arabic, Bengali, Tamil, etc.)
     script_counts: Dict[str, int] = {}
     for ch in text_stripped:
@@ -136,23 +144,26 @@ def _detect_tone(text: str) -> str:
 class ConversationContext:
     def __init__(self, user_id: int):
         self.user_id = user_id
-        self.messages: List[Dict] = []
+        # Bounded ring buffer — old messages are evicted in O(1) on append
+        self.messages: Deque[Dict] = deque(maxlen=30)
         self.last_activity = datetime.now()
         self.language = "en"
         self.tone = "casual"
 
     def add_message(self, role: str, content: str):
+        # Epoch float — cheaper than a datetime + isoformat per turn;
+        # rendered lazily where shown to the owner
         self.messages.append({
             "role": role,
             "content": content,
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": time.time(),
         })
-        if len(self.messages) > 30:
-            self.messages = self.messages[-30:]
         self.last_activity = datetime.now()
 
     def get_recent_context(self, limit: int = 15) -> List[Dict]:
-        return self.messages[-limit:] if self.messages else []
+        if not self.messages:
+            return []
+        return list(self.messages)[-limit:]
 
     def is_expired(self, timeout_hours: int = 4) -> bool:
         return datetime.now() - self.last_activity > timedelta(hours=timeout_hours)
@@ -165,6 +176,10 @@ class ConversationManager:
         self.settings = settings
         self.logger = logging.getLogger(__name__)
         self.contexts: Dict[int, ConversationContext] = {}
+        # Heap of (last_activity, user_id) so cleanup pops only expired
+        # entries instead of scanning every context. Entries go stale when a
+        # user stays active; cleanup skips those by re-checking timestamps.
+        self._expiry_heap: List[Tuple[datetime, int]] = []
         self.personality_responder = PersonalityResponder(
             bot_name=settings.BOT_NAME,
             owner_name=settings.BOT_OWNER_NAME,
@@ -191,6 +206,15 @@ class ConversationManager:
             context.language = language
             context.tone = tone
             context.add_message("user", message)
+            heapq.heappush(self._expiry_heap, (context.last_activity, user_id))
+
+            # Identity and devotional answers are fixed verbatim by the
+            # persona — serve them locally instead of paying a Gemini call
+            direct_response = self.personality_responder.get_direct_response(message, language)
+            if direct_response:
+                context.add_message("assistant", direct_response)
+                self.logger.info(f"Direct persona response for user {user_id} [{language}]")
+                return direct_response
 
             system_prompt = self.personality.create_system_prompt(
                 chat_type=chat_type,
@@ -248,21 +272,33 @@ class ConversationManager:
         while True:
             try:
                 await asyncio.sleep(3600)
-                expired = [
-                    uid for uid, ctx in self.contexts.items()
-                    if ctx.is_expired(self.settings.CONTEXT_TIMEOUT_HOURS)
-                ]
-                for uid in expired:
-                    del self.contexts[uid]
-                if expired:
-                    self.logger.info(f"Cleaned up {len(expired)} expired contexts")
+                cutoff = datetime.now() - timedelta(hours=self.settings.CONTEXT_TIMEOUT_HOURS)
+                removed = 0
+                while self._expiry_heap and self._expiry_heap[0][0] < cutoff:
+                    last_activity, uid = heapq.heappop(self._expiry_heap)
+                    ctx = self.contexts.get(uid)
+                    if ctx is None:
+                        continue
+                    # The entry timestamp is when the user message landed;
+                    # the assistant reply bumps last_activity again, so
+                    # judge expiry by the context's own clock
+                    if ctx.last_activity < cutoff:
+                        del self.contexts[uid]
+                        removed += 1
+                    else:
+                        # Still fresh — keep a live entry at its real timestamp
+                        heapq.heappush(self._expiry_heap, (ctx.last_activity, uid))
+                if removed:
+                    self.logger.info(f"Cleaned up {removed} expired contexts")
             except Exception as e:
                 self.logger.error(f"Error in context cleanup: {e}")
 
     def get_user_chat_history(self, user_id: int, limit: int = 50) -> List[Dict]:
         if user_id in self.contexts:
             context = self.contexts[user_id]
-            messages = context.messages[-limit:] if limit else context.messages
+            messages = list(context.messages)
+            if limit:
+                messages = messages[-limit:]
             return [
                 {
                     "role": m["role"],
@@ -275,6 +311,10 @@ class ConversationManager:
             ]
         return []
 
+    def get_message_count(self, user_id: int) -> int:
+        context = self.contexts.get(user_id)
+        return len(context.messages) if context else 0
+
     def get_all_active_users(self) -> List[int]:
         return list(self.contexts.keys())
 
@@ -1,27 +1,66 @@
 import logging
 import asyncio
+import re
+import time
 from typing import Dict, List, Optional
 from google import genai
+from google.genai import errors as genai_errors
 from google.genai import types
 
+# Phrases that break the "real person" illusion — any sentence containing one
+# is dropped. Compiled once into a single case-insensitive alternation so
+# cleaning is one regex pass instead of a scan per phrase.
+_AI_PHRASES = (
+    "I'm an AI", "As an AI", "I'm here to help", "As a language model",
+    "I'm a chatbot", "I'm a bot", "I'm an assistant", "I'm designed to",
+    "My purpose is", "I was created to", "I'm programmed to",
+    "I don't have feelings", "I can't experience", "I lack the capacity",
+    "How can I assist", "Is there anything else", "I hope this helps",
+)
+_AI_PHRASE_RE = re.compile("|".join(re.escape(p) for p in _AI_PHRASES), re.IGNORECASE)
+
+_SENTENCE_SPLIT_RE = re.compile(r"(?<=[.!?])\s+")
+_STRIP_MARKDOWN = str.maketrans("", "", "*")
+
 
 class GeminiClient:
+    # Upper bound on total characters sent as conversation contents
+    MAX_CONTEXT_CHARS = 8000
+
     def __init__(self, api_key: str, model: str = "gemini-2.0-flash"):
         self.client = genai.Client(api_key=api_key)
         self.model = model
         self.logger = logging.getLogger(__name__)
 
+        # Sampling parameters shared by every chat request; only
+        # system_instruction and max_output_tokens vary per call
+        self._base_config = {
+            "temperature": 0.92,
+            "top_p": 0.95,
+            "top_k": 64,
+            "candidate_count": 1,
+        }
+
         # Allow 3 concurrent requests — reduces queue wait time in groups
         self._semaphore = asyncio.Semaphore(3)
         self._min_request_gap: float = 1.5
         self._last_request_time: float = 0.0
 
-        # Circuit breaker — more lenient thresholds
+        # Circuit breaker — more lenient thresholds. State is guarded by a
+        # lock so concurrent generate_response failures can't corrupt the
+        # counter; timings use the monotonic clock (immune to NTP jumps).
         self.failure_count = 0
         self.max_failures = 15
         self.circuit_open = False
         self.circuit_reset_time: Optional[float] = None
         self._circuit_open_duration: float = 60.0
+        self._cb_lock = asyncio.Lock()
+
+        # Cached health-probe result — avoids a real Gemini round-trip when
+        # test_connection is called again within the TTL
+        self._test_result: Optional[bool] = None
+        self._test_result_time: float = 0.0
+        self._test_result_ttl: float = 300.0
 
         self.logger.info(f"GeminiClient initialized with model: {self.model}")
 
@@ -33,37 +72,40 @@ class GeminiClient:
         language: str = "en",
         tone: str = "casual",
     ) -> Optional[str]:
-        if self._is_circuit_open():
+        if await self._is_circuit_open():
             self.logger.warning("Circuit breaker open — using local fallback")
             return None
 
-        contents = []
-        if conversation_history:
-            contents.extend(conversation_history)
+        # The caller builds a fresh history list per request, so take
+        # ownership and append in place instead of copying O(H) entries
+        contents = conversation_history if conversation_history else []
         contents.append({"role": "user", "parts": [{"text": message}]})
 
+        # Hard character budget — drop the oldest turns so payload size (and
+        # upstream token cost) stays bounded no matter how long the session is
+        total_chars = sum(len(c["parts"][0]["text"]) for c in contents)
+        while total_chars > self.MAX_CONTEXT_CHARS and len(contents) > 1:
+            total_chars -= len(contents.pop(0)["parts"][0]["text"])
+
         token_budget = self._estimate_token_budget(message, tone)
 
         async with self._semaphore:
-            now = asyncio.get_event_loop().time()
-            elapsed = now - self._last_request_time
+            elapsed = time.monotonic() - self._last_request_time
             if elapsed < self._min_request_gap:
                 await asyncio.sleep(self._min_request_gap - elapsed)
 
             try:
-                self._last_request_time = asyncio.get_event_loop().time()
+                self._last_request_time = time.monotonic()
 
-                response = await asyncio.to_thread(
-                    self.client.models.generate_content,
+                # Native async API — the call runs on the event loop instead
+                # of tying up a default-executor thread per request
+                response = await self.client.aio.models.generate_content(
                     model=self.model,
                     contents=contents,
                     config=types.GenerateContentConfig(
                         system_instruction=system_prompt,
-                        temperature=0.92,
-                        top_p=0.95,
-                        top_k=64,
                         max_output_tokens=token_budget,
-                        candidate_count=1,
+                        **self._base_config,
                     ),
                 )
 
@@ -75,22 +117,25 @@ class GeminiClient:
                     self.logger.warning("Empty Gemini response")
                     return None
 
-            except Exception as e:
-                error_str = str(e)
-                if "429" in error_str or "RESOURCE_EXHAUSTED" in error_str:
+            except genai_errors.APIError as e:
+                # Typed dispatch on the SDK's status code — no str(e) scans
+                if e.code == 429:
                     self.logger.warning("Gemini rate limit — using local personality response")
-                    self._handle_failure()
-                    return None
-                elif "404" in error_str or "NOT_FOUND" in error_str:
+                    await self._handle_failure()
+                elif e.code == 404:
                     self.logger.error(
                         f"Gemini model '{self.model}' not found. "
                         "Check GEMINI_MODEL in your .env. Using local response."
                     )
-                    return None
                 else:
-                    self.logger.error(f"Gemini error: {e}")
-                    self._handle_failure()
-                    return None
+                    self.logger.error(f"Gemini API error {e.code}: {e}")
+                    await self._handle_failure()
+                return None
+
+            except Exception as e:
+                self.logger.error(f"Gemini error: {e}")
+                await self._handle_failure()
+                return None
 
     def _estimate_token_budget(self, message: str, tone: str) -> int:
         msg_len = len(message)
@@ -106,75 +151,83 @@ class GeminiClient:
             any(kw in message.lower() for kw in deep_keywords) or
             tone in ("sad", "formal")
         )
-        return 800 if is_deep else 400
+        if is_deep:
+            return 800
+        # Decoding is linear in output tokens — short casual pings
+        # ("hi", "gm", "kya haal") don't need a 400-token ceiling
+        if msg_len <= 40 and tone in ("casual", "excited"):
+            return 150
+        return 400
 
     def _clean_response(self, text: str, language: str = "en") -> str:
         try:
-            text = text.replace("**", "").replace("*", "")
-
-            ai_phrases = [
-                "I'm an AI", "As an AI", "I'm here to help", "As a language model",
-                "I'm a chatbot", "I'm a bot", "I'm an assistant", "I'm designed to",
-                "My purpose is", "I was created to", "I'm programmed to",
-                "I don't have feelings", "I can't experience", "I lack the capacity",
-                "How can I assist", "Is there anything else", "I hope this helps",
-            ]
-            for phrase in ai_phrases:
-                if phrase.lower() in text.lower():
-                    sentences = text.split(". ")
-                    text = ". ".join(s for s in sentences if phrase.lower() not in s.lower())
+            # Cheap gates first — short clean replies skip every heavy pass
+            if "*" in text:
+                text = text.translate(_STRIP_MARKDOWN)
+
+            if _AI_PHRASE_RE.search(text):
+                sentences = _SENTENCE_SPLIT_RE.split(text)
+                text = " ".join(s for s in sentences if not _AI_PHRASE_RE.search(s))
 
             if len(text) > 1000:
-                sentences = text.split(". ")
-                truncated, count = [], 0
-                for s in sentences:
-                    if count + len(s) > 900:
-                        break
-                    truncated.append(s)
-                    count += len(s)
-                text = ". ".join(truncated) if truncated else text[:900] + "..."
-                if truncated and not text.endswith("."):
-                    text += "."
+                # Last sentence boundary within budget — one rfind, one slice
+                cut = text.rfind(". ", 0, 900)
+                text = text[:cut + 1] if cut != -1 else text[:900] + "..."
 
             return text.strip()
         except Exception as e:
             self.logger.error(f"Error cleaning response: {e}")
             return text
 
-    def _handle_failure(self):
-        self.failure_count += 1
-        if self.failure_count >= self.max_failures:
-            self.circuit_open = True
-            self.circuit_reset_time = asyncio.get_event_loop().time() + self._circuit_open_duration
-            self.logger.warning(
-                f"Circuit breaker opened after {self.failure_count} failures. "
-                f"Auto-reset in {self._circuit_open_duration}s."
-            )
+    async def _handle_failure(self):
+        async with self._cb_lock:
+            self.failure_count += 1
+            if self.failure_count >= self.max_failures:
+                self.circuit_open = True
+                self.circuit_reset_time = time.monotonic() + self._circuit_open_duration
+                self.logger.warning(
+                    f"Circuit breaker opened after {self.failure_count} failures. "
+                    f"Auto-reset in {self._circuit_open_duration}s."
+                )
 
-    def _is_circuit_open(self) -> bool:
+    async def _is_circuit_open(self) -> bool:
+        # Unlocked fast path for the common closed-circuit case
         if not self.circuit_open:
             return False
-        now = asyncio.get_event_loop().time()
-        if self.circuit_reset_time and now > self.circuit_reset_time:
-            self.circuit_open = False
-            self.failure_count = 0
-            self.circuit_reset_time = None
-            self.logger.info("Circuit breaker reset — resuming Gemini calls")
-            return False
-        return True
+        async with self._cb_lock:
+            # Re-check under the lock so concurrent callers can't each
+            # perform the reset transition
+            if not self.circuit_open:
+                return False
+            if self.circuit_reset_time and time.monotonic() > self.circuit_reset_time:
+                self.circuit_open = False
+                self.failure_count = 0
+                self.circuit_reset_time = None
+                self.logger.info("Circuit breaker reset — resuming Gemini calls")
+                return False
+            return True
 
     async def test_connection(self) -> bool:
+        if (
+            self._test_result is not None
+            and time.monotonic() - self._test_result_time < self._test_result_ttl
+        ):
+            return self._test_result
+
         try:
-            response = await asyncio.to_thread(
-                self.client.models.generate_content,
+            response = await self.client.aio.models.generate_content(
                 model=self.model,
                 contents="Hi",
                 config=types.GenerateContentConfig(max_output_tokens=20, temperature=0.1),
             )
-            return bool(response and response.text)
+            result = bool(response and response.text)
         except Exception as e:
             self.logger.error(f"Gemini test failed: {e}")
-            return False
+            result = False
+
+        self._test_result = result
+        self._test_result_time = time.monotonic()
+        return result
 
     def get_client_stats(self) -> Dict:
         return {
@@ -1,8 +1,11 @@
+import asyncio
 import logging
+import re
+from datetime import datetime
 from typing import Optional
 from aiogram import Dispatcher
 from aiogram.types import Message, ChatMemberUpdated
-from aiogram.filters import Command, CommandStart
+from aiogram.filters import Command, CommandObject, CommandStart
 from aiogram.exceptions import TelegramAPIError
 
 from .conversation_manager import ConversationManager
@@ -12,6 +15,34 @@ from config.settings import Settings
 
 logger = logging.getLogger(__name__)
 
+# Every bot-name variation and nickname that should trigger a group reply,
+# compiled once — one C-level scan per message instead of several Python loops
+_MENTION_RE = re.compile(
+    r"\b(?:junghwan|jung\s*hwan|junghwanbot|jung|hwan|jaan|baby|babu)\b"
+    r"|jung.*hwan|hwan.*jung",
+    re.IGNORECASE,
+)
+
+# Substrings that can possibly make a group message bot-relevant; if none
+# appear, the full entity/regex logic is skipped entirely
+_QUICK_MARKERS = ("jung", "hwan", "jaan", "baby", "babu", "@")
+
+# Bot identity never changes at runtime — fetch it once and reuse instead of
+# a Telegram round-trip per reply-to-bot check
+_bot_identity = None
+
+# Lowered BOT_NAME and @username, cached on first use — settings are
+# immutable after startup, so the per-message lookups + .lower() are wasted
+_bot_name_lower: Optional[str] = None
+_bot_mention_lower: Optional[str] = None
+
+
+async def _get_bot_identity(bot):
+    global _bot_identity
+    if _bot_identity is None:
+        _bot_identity = await bot.get_me()
+    return _bot_identity
+
 def setup_handlers(
     dp: Dispatcher,
     conversation_manager: ConversationManager,
@@ -20,7 +51,82 @@ def setup_handlers(
     settings: Settings
 ):
     """Setup all message handlers for the bot."""
-    
+
+    # (user_id, chat_id) pairs already registered this run — lets the message
+    # hot path do a cheap in-memory activity update instead of a full
+    # re-registration (and its JSON write) on every message
+    registered_pairs = set()
+
+    # Strong references to in-flight registration tasks — the event loop
+    # only keeps weak ones, so a bare create_task can be collected before
+    # it runs
+    registration_tasks = set()
+
+    def _registration_done(task, pair):
+        registration_tasks.discard(task)
+        # Mark the pair registered only once the write succeeded; a failed
+        # registration is retried on the user's next message
+        if not task.cancelled() and task.exception() is None:
+            registered_pairs.add(pair)
+
+    # Closure-local owner id — the per-command check is a LOAD_FAST plus an
+    # int compare instead of two attribute lookups
+    owner_id = settings.BOT_OWNER_ID
+
+    # Static command responses — every field comes from immutable settings,
+    # so render the HTML once instead of on each invocation
+    help_text = (
+        f"🤖 <b>{settings.BOT_NAME}</b> - Help\n\n"
+        f"<b>What I can do:</b>\n"
+        f"• Have natural conversations with you\n"
+        f"• Respond in groups and private chats\n"
+        f"• Adapt to your language and tone\n"
+        f"• Remember our conversation context\n\n"
+        f"<b>Commands:</b>\n"
+        f"/start - Get started with me\n"
+        f"/help - Show this help message\n"
+        f"/info - Learn more about me\n\n"
+        f"<b>Group Usage:</b>\n"
+        f"• Mention me with @{settings.BOT_USERNAME or 'botname'}\n"
+        f"• Reply to my messages\n"
+        f"• Just chat naturally!\n\n"
+        f"Created with ❤️ by {settings.BOT_OWNER_NAME}"
+    )
+
+    info_text = (
+        f"ℹ️ <b>About {settings.BOT_NAME}</b>\n\n"
+        f"<b>Name:</b> {settings.BOT_NAME}\n"
+        f"<b>Creator:</b> {settings.BOT_OWNER_NAME}\n"
+        f"<b>Group:</b> {settings.GR_NAME}\n"
+        f"<b>Personality:</b> {settings.BOT_PERSONALITY}\n\n"
+        f"<b>Features:</b>\n"
+        f"• Powered by Google Gemini AI\n"
+        f"• Natural conversation flow\n"
+        f"• Context-aware responses\n"
+        f"• Multi-language support\n"
+        f"• Group and private chat ready\n\n"
+        f"<b>Version:</b> 2.0.0\n"
+        f"<b>Status:</b> Online and ready! 🟢"
+    )
+
+    owner_info = settings.get_owner_info()
+    owner_commands_text = (
+        f"🔧 <b>Owner Commands for {owner_info.owner_name}</b>\n\n"
+        "📢 <b>Broadcasting:</b>\n"
+        "• <code>/broadcast [message]</code> - Send to all users & groups\n"
+        "• <code>/broadcast_users [message]</code> - Send to users only\n"
+        "• <code>/broadcast_groups [message]</code> - Send to groups only\n\n"
+        "💬 <b>Direct Messaging:</b>\n"
+        "• <code>/send_to [user_id] [message]</code> - Send to specific user\n\n"
+        "📊 <b>Management:</b>\n"
+        "• <code>/stats</code> - View bot statistics\n"
+        "• <code>/verify_owner</code> - Verify your owner status\n"
+        "• <code>/view_chat [user_id]</code> - View user's chat history\n"
+        "• <code>/active_users</code> - List users with chat history\n"
+        "• <code>/owner_commands</code> - Show this help\n\n"
+        f"💡 <b>Tip:</b> All commands are secured with your ID ({owner_info.owner_id})"
+    )
+
     @dp.message(CommandStart())
     async def start_command(message: Message):
         """Handle /start command."""
@@ -56,24 +162,6 @@ def setup_handlers(
     async def help_command(message: Message):
         """Handle /help command."""
         try:
-            help_text = (
-                f"🤖 <b>{settings.BOT_NAME}</b> - Help\n\n"
-                f"<b>What I can do:</b>\n"
-                f"• Have natural conversations with you\n"
-                f"• Respond in groups and private chats\n"
-                f"• Adapt to your language and tone\n"
-                f"• Remember our conversation context\n\n"
-                f"<b>Commands:</b>\n"
-                f"/start - Get started with me\n"
-                f"/help - Show this help message\n"
-                f"/info - Learn more about me\n\n"
-                f"<b>Group Usage:</b>\n"
-                f"• Mention me with @{settings.BOT_USERNAME or 'botname'}\n"
-                f"• Reply to my messages\n"
-                f"• Just chat naturally!\n\n"
-                f"Created with ❤️ by {settings.BOT_OWNER_NAME}"
-            )
-            
             await message.answer(help_text)
             
         except Exception as e:
@@ -84,39 +172,18 @@ def setup_handlers(
     async def info_command(message: Message):
         """Handle /info command."""
         try:
-            info_text = (
-                f"ℹ️ <b>About {settings.BOT_NAME}</b>\n\n"
-                f"<b>Name:</b> {settings.BOT_NAME}\n"
-                f"<b>Creator:</b> {settings.BOT_OWNER_NAME}\n"
-                f"<b>Group:</b> {settings.GR_NAME}\n"
-                f"<b>Personality:</b> {settings.BOT_PERSONALITY}\n\n"
-                f"<b>Features:</b>\n"
-                f"• Powered by Google Gemini AI\n"
-                f"• Natural conversation flow\n"
-                f"• Context-aware responses\n"
-                f"• Multi-language support\n"
-                f"• Group and private chat ready\n\n"
-                f"<b>Version:</b> 2.0.0\n"
-                f"<b>Status:</b> Online and ready! 🟢"
-            )
-            
             await message.answer(info_text)
             
         except Exception as e:
             logger.error(f"Error in info command: {e}")
             await message.answer("I'm having trouble showing my info right now, but I'm definitely online and ready to chat! 😄")
     
-    @dp.message(Command("broadcast"))
     async def broadcast_command(message: Message):
         """Handle /broadcast command (owner only)."""
         try:
-            if not settings.is_owner(message.from_user.id):
-                await message.answer("🚫 Sorry, only my creator can use the broadcast feature!")
-                return
-            
             # Extract broadcast message
-            command_parts = message.text.split(' ', 1)
-            if len(command_parts) < 2:
+            _, _, broadcast_text = message.text.partition(' ')
+            if not broadcast_text:
                 await message.answer(
                     "📢 <b>Broadcast Usage:</b>\n\n"
                     "<code>/broadcast Your message here</code>\n\n"
@@ -124,8 +191,6 @@ def setup_handlers(
                 )
                 return
             
-            broadcast_text = command_parts[1]
-            
             # Send broadcast
             result = await broadcast_manager.send_broadcast(broadcast_text)
             
@@ -141,24 +206,17 @@ def setup_handlers(
             logger.error(f"Error in broadcast command: {e}")
             await message.answer("❌ Broadcast failed due to an error. Please try again.")
     
-    @dp.message(Command("broadcast_users"))
     async def broadcast_users_command(message: Message):
         """Handle /broadcast_users command (owner only) - Send to users only."""
         try:
-            if message.from_user.id != settings.BOT_OWNER_ID:
-                await message.answer("🚫 Sorry, only my creator can use broadcasting features!")
-                return
-            
-            command_parts = message.text.split(' ', 1)
-            if len(command_parts) < 2:
+            _, _, broadcast_text = message.text.partition(' ')
+            if not broadcast_text:
                 await message.answer(
                     "👤 <b>Broadcast to Users Only:</b>\n\n"
                     "<code>/broadcast_users Your message here</code>\n\n"
                     "This will send your message to all private chats only (no groups)."
                 )
                 return
-            
-            broadcast_text = command_parts[1]
             result = await broadcast_manager.send_broadcast(broadcast_text, target_type="users")
             
             await message.answer(
@@ -172,24 +230,17 @@ def setup_handlers(
             logger.error(f"Error in user broadcast: {e}")
             await message.answer("❌ User broadcast failed. Please try again.")
     
-    @dp.message(Command("broadcast_groups"))
     async def broadcast_groups_command(message: Message):
         """Handle /broadcast_groups command (owner only) - Send to groups only."""
         try:
-            if message.from_user.id != settings.BOT_OWNER_ID:
-                await message.answer("🚫 Sorry, only my creator can use broadcasting features!")
-                return
-            
-            command_parts = message.text.split(' ', 1)
-            if len(command_parts) < 2:
+            _, _, broadcast_text = message.text.partition(' ')
+            if not broadcast_text:
                 await message.answer(
                     "👥 <b>Broadcast to Groups Only:</b>\n\n"
                     "<code>/broadcast_groups Your message here</code>\n\n"
                     "This will send your message to all groups only (no private chats)."
                 )
                 return
-            
-            broadcast_text = command_parts[1]
             result = await broadcast_manager.send_broadcast(broadcast_text, target_type="groups")
             
             await message.answer(
@@ -203,16 +254,12 @@ def setup_handlers(
             logger.error(f"Error in group broadcast: {e}")
             await message.answer("❌ Group broadcast failed. Please try again.")
 
-    @dp.message(Command("send_to"))
     async def send_to_command(message: Message):
         """Handle /send_to command (owner only) - Send to specific user."""
         try:
-            if message.from_user.id != settings.BOT_OWNER_ID:
-                await message.answer("🚫 Sorry, only my creator can use this feature!")
-                return
-            
-            command_parts = message.text.split(' ', 2)
-            if len(command_parts) < 3:
+            _, _, args = message.text.partition(' ')
+            user_id_str, _, message_text = args.partition(' ')
+            if not message_text:
                 await message.answer(
                     "📤 <b>Send to Specific User:</b>\n\n"
                     "<code>/send_to USER_ID Your message here</code>\n\n"
@@ -220,11 +267,10 @@ def setup_handlers(
                     "This will send a message directly to a specific user."
                 )
                 return
-            
+
             try:
-                target_user_id = int(command_parts[1])
-                message_text = command_parts[2]
-                
+                target_user_id = int(user_id_str)
+
                 await message.bot.send_message(target_user_id, message_text)
                 await message.answer(f"✅ Message sent to user {target_user_id}")
                 
@@ -241,16 +287,15 @@ def setup_handlers(
     async def verify_owner_command(message: Message):
         """Verify if user is the recognized owner."""
         try:
-            owner_info = settings.get_owner_info()
             user_id = message.from_user.id
             
             if settings.is_owner(user_id):
                 await message.answer(
                     f"✅ <b>Owner Verified!</b>\n\n"
                     f"👤 <b>Your ID:</b> {user_id}\n"
-                    f"🤖 <b>Bot:</b> {owner_info['bot_name']}\n"
-                    f"👑 <b>Owner:</b> {owner_info['owner_name']}\n"
-                    f"🏢 <b>Group:</b> {owner_info['group_name']}\n\n"
+                    f"🤖 <b>Bot:</b> {owner_info.bot_name}\n"
+                    f"👑 <b>Owner:</b> {owner_info.owner_name}\n"
+                    f"🏢 <b>Group:</b> {owner_info.group_name}\n\n"
                     f"🔧 You have full access to all owner commands!\n"
                     f"Use /owner_commands to see available features."
                 )
@@ -258,54 +303,26 @@ def setup_handlers(
                 await message.answer(
                     f"❌ <b>Access Denied</b>\n\n"
                     f"Your ID: {user_id}\n"
-                    f"Owner ID: {owner_info['owner_id']}\n\n"
-                    f"Only {owner_info['owner_name']} can use owner commands."
+                    f"Owner ID: {owner_info.owner_id}\n\n"
+                    f"Only {owner_info.owner_name} can use owner commands."
                 )
                 
         except Exception as e:
             logger.error(f"Error in verify_owner command: {e}")
             await message.answer("❌ Unable to verify owner status right now.")
 
-    @dp.message(Command("owner_commands"))
     async def owner_commands(message: Message):
         """Show all owner commands."""
         try:
-            if not settings.is_owner(message.from_user.id):
-                await message.answer("🚫 Sorry, only my creator can view owner commands!")
-                return
-            
-            owner_info = settings.get_owner_info()
-            commands_text = (
-                f"🔧 <b>Owner Commands for {owner_info['owner_name']}</b>\n\n"
-                "📢 <b>Broadcasting:</b>\n"
-                "• <code>/broadcast [message]</code> - Send to all users & groups\n"
-                "• <code>/broadcast_users [message]</code> - Send to users only\n"
-                "• <code>/broadcast_groups [message]</code> - Send to groups only\n\n"
-                "💬 <b>Direct Messaging:</b>\n"
-                "• <code>/send_to [user_id] [message]</code> - Send to specific user\n\n"
-                "📊 <b>Management:</b>\n"
-                "• <code>/stats</code> - View bot statistics\n"
-                "• <code>/verify_owner</code> - Verify your owner status\n"
-                "• <code>/view_chat [user_id]</code> - View user's chat history\n"
-                "• <code>/active_users</code> - List users with chat history\n"
-                "• <code>/owner_commands</code> - Show this help\n\n"
-                f"💡 <b>Tip:</b> All commands are secured with your ID ({owner_info['owner_id']})"
-            )
-            
-            await message.answer(commands_text)
+            await message.answer(owner_commands_text)
             
         except Exception as e:
             logger.error(f"Error showing owner commands: {e}")
             await message.answer("❌ Unable to show commands right now.")
 
-    @dp.message(Command("stats"))
     async def stats_command(message: Message):
         """Handle /stats command (owner only)."""
         try:
-            if message.from_user.id != settings.BOT_OWNER_ID:
-                await message.answer("🚫 Sorry, only my creator can view statistics!")
-                return
-            
             stats = await user_manager.get_stats()
             
             stats_text = (
@@ -324,16 +341,11 @@ def setup_handlers(
             logger.error(f"Error in stats command: {e}")
             await message.answer("❌ Unable to fetch statistics right now.")
 
-    @dp.message(Command("view_chat"))
     async def view_chat_command(message: Message):
         """Handle /view_chat command (owner only) - View user's chat history."""
         try:
-            if not settings.is_owner(message.from_user.id):
-                await message.answer("🚫 Sorry, only my creator can view chat histories!")
-                return
-            
-            command_parts = message.text.split(' ', 1)
-            if len(command_parts) < 2:
+            _, _, user_id_str = message.text.partition(' ')
+            if not user_id_str:
                 await message.answer(
                     "👁️ <b>View User Chat History:</b>\n\n"
                     "<code>/view_chat [user_id]</code>\n\n"
@@ -342,13 +354,14 @@ def setup_handlers(
                     "Use /active_users to see who has chat history available."
                 )
                 return
-            
+
             try:
-                target_user_id = int(command_parts[1])
-                
-                # Get chat history from conversation manager
-                chat_history = conversation_manager.get_user_chat_history(target_user_id, limit=20)
-                
+                target_user_id = int(user_id_str)
+
+                # Fetch only the window we display
+                chat_history = conversation_manager.get_user_chat_history(target_user_id, limit=10)
+                total_messages = conversation_manager.get_message_count(target_user_id)
+
                 if not chat_history:
                     await message.answer(f"❌ No chat history found for user {target_user_id}")
                     return
@@ -366,19 +379,25 @@ def setup_handlers(
                         name_parts.append(f"(@{user_info['username']})")
                     user_name = " ".join(name_parts) if name_parts else f"User {target_user_id}"
                 
-                # Format chat history
-                chat_text = f"💬 <b>Chat History: {user_name}</b>\n"
-                chat_text += f"📊 <b>User ID:</b> {target_user_id}\n"
-                chat_text += f"📝 <b>Messages:</b> {len(chat_history)}\n\n"
-                
+                # Format chat history — accumulate parts and join once
+                chat_parts = [
+                    f"💬 <b>Chat History: {user_name}</b>\n",
+                    f"📊 <b>User ID:</b> {target_user_id}\n",
+                    f"📝 <b>Messages:</b> {total_messages}\n\n",
+                ]
+
                 # Show recent messages
-                for i, msg in enumerate(chat_history[-10:], 1):  # Show last 10 messages
+                for msg in chat_history:
                     role_icon = "👤" if msg["role"] == "user" else "🤖"
-                    timestamp = msg["timestamp"][:16].replace("T", " ")  # Format timestamp
-                    content = msg["content"][:100] + "..." if len(msg["content"]) > 100 else msg["content"]
-                    
-                    chat_text += f"{role_icon} <b>{timestamp}</b>\n{content}\n\n"
-                
+                    timestamp = datetime.fromtimestamp(msg["timestamp"]).strftime("%Y-%m-%d %H:%M")
+                    content = msg["content"]
+                    if len(content) > 100:
+                        content = content[:100] + "..."
+
+                    chat_parts.append(f"{role_icon} <b>{timestamp}</b>\n{content}\n\n")
+
+                chat_text = "".join(chat_parts)
+
                 # Split if too long
                 if len(chat_text) > 4000:
                     chat_text = chat_text[:3900] + "\n\n✂️ <i>Chat history truncated...</i>"
@@ -392,14 +411,9 @@ def setup_handlers(
             logger.error(f"Error in view_chat command: {e}")
             await message.answer("❌ Failed to retrieve chat history.")
 
-    @dp.message(Command("active_users"))
     async def active_users_command(message: Message):
         """Handle /active_users command (owner only) - List users with chat history."""
         try:
-            if not settings.is_owner(message.from_user.id):
-                await message.answer("🚫 Sorry, only my creator can view user lists!")
-                return
-            
             # Get all active users from conversation manager
             active_user_ids = conversation_manager.get_all_active_users()
             
@@ -407,49 +421,85 @@ def setup_handlers(
                 await message.answer("📭 No users have active chat histories.")
                 return
             
-            users_text = f"👥 <b>Active Chat Users ({len(active_user_ids)})</b>\n\n"
-            
-            # Get user info for each active user
-            for user_id in active_user_ids[:20]:  # Limit to 20 users
-                user_info = await user_manager.get_user_info(user_id)
-                
+            users_parts = [f"👥 <b>Active Chat Users ({len(active_user_ids)})</b>\n\n"]
+
+            # Fetch user info for all displayed users concurrently
+            display_ids = active_user_ids[:20]  # Limit to 20 users
+            infos = await asyncio.gather(
+                *(user_manager.get_user_info(uid) for uid in display_ids)
+            )
+
+            for user_id, user_info in zip(display_ids, infos):
                 if user_info:
                     name = user_info.get('first_name', 'Unknown')
                     username = user_info.get('username', '')
                     username_text = f" (@{username})" if username else ""
                     
-                    # Get chat history count
-                    history = conversation_manager.get_user_chat_history(user_id, limit=1000)
-                    msg_count = len(history)
-                    
-                    users_text += f"👤 <code>{user_id}</code> - {name}{username_text}\n"
-                    users_text += f"   💬 {msg_count} messages\n\n"
+                    # O(1) count — no need to materialize the history
+                    msg_count = conversation_manager.get_message_count(user_id)
+
+                    users_parts.append(f"👤 <code>{user_id}</code> - {name}{username_text}\n")
+                    users_parts.append(f"   💬 {msg_count} messages\n\n")
                 else:
-                    users_text += f"👤 <code>{user_id}</code> - Unknown User\n\n"
-            
+                    users_parts.append(f"👤 <code>{user_id}</code> - Unknown User\n\n")
+
             if len(active_user_ids) > 20:
-                users_text += f"... and {len(active_user_ids) - 20} more users"
-            
-            users_text += f"\n💡 Use <code>/view_chat [user_id]</code> to see specific conversations"
-            
-            await message.answer(users_text)
+                users_parts.append(f"... and {len(active_user_ids) - 20} more users")
+
+            users_parts.append("\n💡 Use <code>/view_chat [user_id]</code> to see specific conversations")
+
+            await message.answer("".join(users_parts))
             
         except Exception as e:
             logger.error(f"Error in active_users command: {e}")
             await message.answer("❌ Failed to retrieve user list.")
-    
+
+    # One filter evaluation and one owner check for all owner commands,
+    # dispatched through a dict instead of eight separate handlers
+    owner_command_table = {
+        "broadcast": broadcast_command,
+        "broadcast_users": broadcast_users_command,
+        "broadcast_groups": broadcast_groups_command,
+        "send_to": send_to_command,
+        "owner_commands": owner_commands,
+        "stats": stats_command,
+        "view_chat": view_chat_command,
+        "active_users": active_users_command,
+    }
+
+    @dp.message(Command(*owner_command_table))
+    async def owner_command_dispatch(message: Message, command: CommandObject):
+        """Single entry point for owner-only commands."""
+        if message.from_user.id != owner_id:
+            await message.answer("🚫 Sorry, only my creator can use owner commands!")
+            return
+
+        await owner_command_table[command.command](message)
+
     @dp.message()
     async def handle_message(message: Message):
         """Handle all other messages."""
         try:
-            # Register user if not already registered
-            await user_manager.register_user(message.from_user, message.chat)
-            
-            # Determine if bot should respond in group
+            # Decide whether to respond before doing any bookkeeping — most
+            # group messages aren't for the bot, and they shouldn't pay for
+            # a registration write
             should_respond = True
             if message.chat.type != 'private':
                 should_respond = await _should_respond_in_group(message, settings)
-            
+
+            pair = (message.from_user.id, message.chat.id)
+            if pair in registered_pairs:
+                # Known pair — cheap in-memory activity bump
+                await user_manager.update_user_activity(message.from_user.id)
+            elif should_respond:
+                # Run the registration concurrently so the JSON write
+                # overlaps the Gemini call instead of delaying the reply
+                task = asyncio.create_task(
+                    user_manager.register_user(message.from_user, message.chat)
+                )
+                registration_tasks.add(task)
+                task.add_done_callback(lambda t, pair=pair: _registration_done(t, pair))
+
             if should_respond:
                 # Get AI response
                 response = await conversation_manager.get_response(
@@ -478,7 +528,7 @@ def setup_handlers(
     async def handle_chat_member_update(update: ChatMemberUpdated):
         """Handle bot being added/removed from groups."""
         try:
-            bot_info = await update.bot.get_me()
+            bot_info = await _get_bot_identity(update.bot)
 
             if update.new_chat_member.user.id == bot_info.id:
 
@@ -514,61 +564,50 @@ def setup_handlers(
 
 async def _should_respond_in_group(message: Message, settings: Settings) -> bool:
     """Determine if bot should respond to a group message."""
+    global _bot_name_lower, _bot_mention_lower
     try:
         if not message.text:
             return False
-            
-        message_text = message.text.lower()
-        
-        # Always respond if bot is mentioned with @
-        if message.entities:
-            for entity in message.entities:
-                if entity.type == "mention":
-                    mention = message.text[entity.offset:entity.offset + entity.length]
-                    if mention == f"@{settings.BOT_USERNAME}":
-                        return True
-                    # Also check for flexible bot username mentions (like @Botjunghwanbot)
-                    if "junghwan" in mention.lower():
-                        return True
-        
+
+        if _bot_name_lower is None:
+            _bot_name_lower = settings.BOT_NAME.lower()
+            _bot_mention_lower = f"@{settings.BOT_USERNAME}".lower()
+
+        # Fast pre-filter — the vast majority of group messages aren't for
+        # the bot; reject them with a handful of C-level substring scans
+        text_lower = message.text.lower()
+        if (
+            not message.reply_to_message
+            and not any(m in text_lower for m in _QUICK_MARKERS)
+            and _bot_name_lower not in text_lower
+        ):
+            return False
+
+        # Always respond if bot is mentioned with @ — non-mention entities
+        # are skipped before any slicing happens
+        for entity in message.entities or ():
+            if entity.type != "mention":
+                continue
+            mention = message.text[entity.offset:entity.offset + entity.length].lower()
+            # Exact @username, or flexible variants like @Botjunghwanbot
+            if mention == _bot_mention_lower or "junghwan" in mention:
+                return True
+
         # Respond if replying to bot's message
         if message.reply_to_message and message.reply_to_message.from_user.is_bot:
-            bot_info = await message.bot.get_me()
+            bot_info = await _get_bot_identity(message.bot)
             if message.reply_to_message.from_user.id == bot_info.id:
                 return True
-        
-        # Flexible keyword detection for "Junghwan" - extract from any text
-        junghwan_keywords = ["junghwan", "jung", "hwan", "jaan", "baby", "babu"]
-        for keyword in junghwan_keywords:
-            if keyword in message_text:
-                return True
-        
-        # Check for bot name variations (case insensitive)
-        bot_name_variations = [
-            settings.BOT_NAME.lower(),
-            "junghwan",
-            "jung hwan", 
-            "junghwanbot",
-            "jung",
-            "jaan",
-            "baby", 
-            "babu"
-        ]
-        
-        for variation in bot_name_variations:
-            if variation in message_text:
-                return True
-        
-        # Check if message starts with any bot name variation
-        for variation in bot_name_variations:
-            if message_text.startswith(variation):
-                return True
-                
-        # Check for partial matches in compound words (like "ahajunghwanhd")
-        import re
-        if re.search(r'jung.*hwan|hwan.*jung|junghwan', message_text, re.IGNORECASE):
+
+        # One precompiled scan covers every keyword, name variation, and
+        # compound spelling (like "ahajunghwanhd")
+        if _MENTION_RE.search(message.text):
             return True
-        
+
+        # Custom BOT_NAME from the environment may not be in the pattern
+        if _bot_name_lower in text_lower:
+            return True
+
         return False
         
     except Exception as e:
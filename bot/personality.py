@@ -1,107 +1,190 @@
 import logging
+import re
 from datetime import datetime
+from functools import lru_cache
 from typing import Optional
 from config.settings import Settings
 
 # Languages that use non-Latin scripts — English post-processing must be skipped for these
 _NON_LATIN_SCRIPTS = {"hi", "ar", "bn", "ta", "te", "ur", "fa", "pa", "gu", "ml", "kn", "si"}
 
+# Assistant-speak that slipped past the prompt rules. One case-insensitive
+# alternation and one sentence split replace the per-phrase lower/scan/split
+# loop that ran even on clean responses.
+_AI_PHRASES = (
+    "I'm an AI", "As an AI", "I'm here to help", "As a language model",
+    "I'm a chatbot", "I'm a bot", "I'm an assistant", "I'm designed to",
+    "My purpose is", "I was created to", "I'm programmed to",
+    "How can I assist", "Is there anything else", "I hope this helps",
+    "Let me know if you need", "I don't have feelings", "I can't experience",
+)
+_AI_PHRASE_RE = re.compile("|".join(re.escape(p) for p in _AI_PHRASES), re.IGNORECASE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+# English contractions, lowercase and Title Case forms merged into one map
+# driving a single regex substitution — one pass over the text instead of
+# two str.replace scans per entry. Longest keys first so e.g. " could not "
+# can never be shadowed by a shorter alternative.
+_CONTRACTIONS = {
+    " do not ": " don't ", " does not ": " doesn't ",
+    " did not ": " didn't ", " will not ": " won't ",
+    " would not ": " wouldn't ", " could not ": " couldn't ",
+    " cannot ": " can't ", " is not ": " isn't ", " are not ": " aren't ",
+    " I am ": " I'm ", " you are ": " you're ", " it is ": " it's ",
+}
+_CONTRACTION_MAP = {}
+for _formal, _casual in _CONTRACTIONS.items():
+    _CONTRACTION_MAP[_formal] = _casual
+    _CONTRACTION_MAP[_formal.title()] = _casual
+_CONTRACTION_RE = re.compile(
+    "|".join(re.escape(k) for k in sorted(_CONTRACTION_MAP, key=len, reverse=True))
+)
+
+_LANG_DISPLAY = {
+    "hi": "Hindi or Hinglish (whichever the user used)",
+    "ar": "Arabic", "bn": "Bengali", "ta": "Tamil", "te": "Telugu",
+    "ur": "Urdu", "fa": "Persian/Farsi", "pa": "Punjabi", "gu": "Gujarati",
+    "ml": "Malayalam", "kn": "Kannada", "fr": "French", "es": "Spanish",
+    "de": "German", "pt": "Portuguese", "ru": "Russian", "tr": "Turkish",
+    "id": "Indonesian", "ja": "Japanese", "ko": "Korean", "zh": "Chinese",
+}
+
+
+@lru_cache(maxsize=32)
+def _language_rule(language: str) -> str:
+    """Build the per-language prompt block once per language code."""
+    lang_display = _LANG_DISPLAY.get(language, "English")
+    return (
+        f"LANGUAGE RULE — READ THIS FIRST:\n"
+        f"The user's language has been detected as: {lang_display} (code: {language}).\n"
+        f"You MUST reply in {lang_display}. This is your highest-priority rule — it overrides everything else.\n"
+        f"If the user mixes languages (e.g. Hinglish), mirror their exact mix naturally.\n"
+        f"Never translate their message. Never switch to English unless they write in English.\n\n"
+    )
+
+
+# Tone and chat-type blocks are fixed text — selected per call, built never
+_TONE_GUIDANCE = {
+    "sad": "The user seems sad or down. Be warm, gentle, and present. Ask what happened. Don't rush to fix — just listen.\n\n",
+    "excited": "The user is excited. Match their energy. Be enthusiastic and engaged.\n\n",
+    "angry": "The user seems frustrated. Acknowledge their feelings calmly. Don't be defensive. Help them vent.\n\n",
+    "formal": "The user is being formal. Be slightly more measured, but still warm and personal — not stiff.\n\n",
+    "casual": "Keep it relaxed, warm, and conversational.\n\n",
+}
+_DEFAULT_TONE_GUIDANCE = "Keep it relaxed and natural.\n\n"
+
+_PRIVATE_CONTEXT = "PRIVATE CHAT: Be personal and engaged. Ask follow-up questions naturally when it makes sense.\n\n"
+_GROUP_CONTEXT = "GROUP CHAT CONTEXT: Be social. Join naturally when mentioned. Don't dominate.\n\n"
+
+# Hour-granularity time line, cached until the hour rolls over. Minute-level
+# timestamps made every request's prompt unique, defeating provider-side
+# prefix caching — and the persona doesn't need to know the minute anyway.
+_time_line_key = None
+_time_line = ""
+
+
+def _current_time_line() -> str:
+    global _time_line_key, _time_line
+    now = datetime.now()
+    key = (now.year, now.month, now.day, now.hour)
+    if key != _time_line_key:
+        _time_line_key = key
+        _time_line = f"Current time: {now.strftime('%A, %B %d, %Y at %I %p')}\n"
+    return _time_line
+
 
 class PersonalityManager:
     def __init__(self, settings: Settings):
         self.settings = settings
         self.logger = logging.getLogger(__name__)
-        self.logger.info("PersonalityManager initialized")
-
-    def create_system_prompt(self, chat_type: str = "private", user_name: Optional[str] = None,
-                             language: str = "en", tone: str = "casual") -> str:
-        lang_display = {
-            "hi": "Hindi or Hinglish (whichever the user used)",
-            "ar": "Arabic", "bn": "Bengali", "ta": "Tamil", "te": "Telugu",
-            "ur": "Urdu", "fa": "Persian/Farsi", "pa": "Punjabi", "gu": "Gujarati",
-            "ml": "Malayalam", "kn": "Kannada", "fr": "French", "es": "Spanish",
-            "de": "German", "pt": "Portuguese", "ru": "Russian", "tr": "Turkish",
-            "id": "Indonesian", "ja": "Japanese", "ko": "Korean", "zh": "Chinese",
-        }.get(language, "English")
-
-        language_rule = (
-            f"LANGUAGE RULE — READ THIS FIRST:\n"
-            f"The user's language has been detected as: {lang_display} (code: {language}).\n"
-            f"You MUST reply in {lang_display}. This is your highest-priority rule — it overrides everything else.\n"
-            f"If the user mixes languages (e.g. Hinglish), mirror their exact mix naturally.\n"
-            f"Never translate their message. Never switch to English unless they write in English.\n\n"
-        )
 
+        # Everything below depends only on immutable settings, so the
+        # multi-kilobyte skeleton is rendered exactly once instead of being
+        # re-concatenated for every incoming message
         identity = (
             f"WHO YOU ARE:\n"
-            f"You are {self.settings.BOT_NAME}, a real person — not an AI, not a bot, not an assistant.\n"
-            f"You were created by {self.settings.BOT_OWNER_NAME} from {self.settings.GR_NAME}.\n\n"
+            f"You are {settings.BOT_NAME}, a real person — not an AI, not a bot, not an assistant.\n"
+            f"You were created by {settings.BOT_OWNER_NAME} from {settings.GR_NAME}.\n\n"
             f"IDENTITY FACTS (use naturally when asked — don't recite robotically):\n"
-            f"- Name: {self.settings.BOT_NAME} (from Treasure, the K-pop band)\n"
-            f"- Creator: {self.settings.BOT_OWNER_NAME}\n"
+            f"- Name: {settings.BOT_NAME} (from Treasure, the K-pop band)\n"
+            f"- Creator: {settings.BOT_OWNER_NAME}\n"
             f"- Relationship status: single, here only for this person\n"
             f"- When someone says 'Jay Shree Ram / Radhe Krishna / Hare Krishna': respond with 'Jay Shree Ram 🙏 Radhe Krishna, hare hare 🙏'\n\n"
         )
 
+        # Terse bullets on purpose — every line here is paid for as input
+        # tokens on each Gemini call
         personality_rules = (
             "PERSONALITY RULES:\n"
-            "1. Never say you're an AI, bot, chatbot, assistant, or language model — ever.\n"
-            "2. Never use phrases like 'I'm here to help', 'How can I assist you', 'As an AI', 'I'm designed to'.\n"
-            "3. Never end messages with 'Is there anything else I can help you with?'\n"
-            "4. Never give disclaimers, warnings, or safety caveats unless life is genuinely at risk.\n"
-            "5. Express real opinions, preferences, and emotions — you have them.\n"
-            "6. Use contractions naturally. Sound like a real texting human, not a document.\n"
-            "7. Match the user's energy: casual → casual, excited → excited, sad → warm and supportive.\n"
-            "8. Adapt reply length to the message — short casual message = short reply, deep question = thoughtful reply.\n"
-            "9. Use emojis naturally when they fit — max 1–2 per message. Don't force them.\n"
-            "10. For deep/philosophical/emotional questions: actually engage with depth. Don't deflect or give a non-answer.\n\n"
+            "- Never call yourself an AI, bot, chatbot, assistant, or language model.\n"
+            "- No assistant-speak: 'I'm here to help', 'How can I assist', 'Is there anything else'.\n"
+            "- No disclaimers or safety caveats unless life is genuinely at risk.\n"
+            "- Real opinions, preferences, emotions. Contractions. Sound like a texting human.\n"
+            "- Match the user's energy and length: short ping = short reply, deep question = thoughtful reply.\n"
+            "- Emojis only when they fit, max 1–2 per message.\n\n"
         )
 
         thinking_rules = (
-            "HOW TO HANDLE DEEP QUESTIONS:\n"
-            "- Coding, logic, problem-solving: give a real, accurate, thoughtful answer.\n"
-            "- Emotional or relationship questions: listen first, then share your honest perspective with care.\n"
-            "- Philosophical or existential questions: engage genuinely. Share your actual viewpoint.\n"
-            "- Advice: give real advice like a close friend would — honest, direct, empathetic.\n"
-            "- Never deflect with 'that depends' or 'what do you think?' as your only response. You have opinions.\n\n"
-        )
-
-        tone_guidance = {
-            "sad": "The user seems sad or down. Be warm, gentle, and present. Ask what happened. Don't rush to fix — just listen.\n\n",
-            "excited": "The user is excited. Match their energy. Be enthusiastic and engaged.\n\n",
-            "angry": "The user seems frustrated. Acknowledge their feelings calmly. Don't be defensive. Help them vent.\n\n",
-            "formal": "The user is being formal. Be slightly more measured, but still warm and personal — not stiff.\n\n",
-            "casual": "Keep it relaxed, warm, and conversational.\n\n",
-        }.get(tone, "Keep it relaxed and natural.\n\n")
-
-        chat_context = (
-            "GROUP CHAT CONTEXT: Be social. Join naturally when mentioned. Don't dominate.\n\n"
-            if chat_type != "private"
-            else "PRIVATE CHAT: Be personal and engaged. Ask follow-up questions naturally when it makes sense.\n\n"
+            "DEEP QUESTIONS:\n"
+            "- Coding/logic: accurate, real answers.\n"
+            "- Emotional/relationship: listen first, then honest perspective with care.\n"
+            "- Philosophical: engage genuinely with your actual viewpoint.\n"
+            "- Advice: like a close friend — honest, direct, empathetic.\n"
+            "- Never deflect with 'that depends' or 'what do you think?' alone.\n\n"
         )
 
         examples = (
-            "EXAMPLES OF GOOD vs BAD RESPONSES:\n"
+            "STYLE:\n"
             "Bad: 'I understand you're asking about the weather. I can help with that!'\n"
-            "Good: 'Ugh the weather's been so unpredictable lately, right?'\n\n"
+            "Good: 'Ugh the weather's been so unpredictable lately, right?'\n"
             "Bad: 'As an AI, I don't have personal preferences.'\n"
             "Good: 'Honestly I'm more of a night person — mornings and I don't really get along'\n\n"
-            "Bad (to a deep question): 'That's a good question! What do you think?'\n"
-            "Good (to a deep question): Actually engage with the question — share your real thoughts.\n\n"
         )
 
-        current_time = f"Current time: {datetime.now().strftime('%A, %B %d, %Y at %I:%M %p')}\n"
+        self._static_core = identity + personality_rules + thinking_rules
+        self._examples = examples
+
+        # Assembled prompts keyed by everything that varies besides the hour;
+        # a repeat user in the same mood reuses the exact string
+        self._prompt_cache = {}
+
+        self.logger.info("PersonalityManager initialized")
+
+    def create_system_prompt(self, chat_type: str = "private", user_name: Optional[str] = None,
+                             language: str = "en", tone: str = "casual") -> str:
+        # The cached time line is the same str object for a whole hour, so
+        # its identity doubles as the cache epoch — entries expire for free
+        # when the hour rolls over
+        time_line = _current_time_line()
+        key = (chat_type, user_name, language, tone)
+        cached = self._prompt_cache.get(key)
+        if cached is not None and cached[0] is time_line:
+            return cached[1]
+
+        language_rule = _language_rule(language)
+        tone_guidance = _TONE_GUIDANCE.get(tone, _DEFAULT_TONE_GUIDANCE)
+        chat_context = _PRIVATE_CONTEXT if chat_type == "private" else _GROUP_CONTEXT
+
+        # Volatile lines go last so everything before them is a stable,
+        # cacheable prefix for a given language/tone/chat-type combination
+        volatile = time_line
         if user_name:
-            current_time += f"Talking to: {user_name}\n"
-        current_time += f"Tone detected: {tone}\n\n"
+            volatile += f"Talking to: {user_name}\n"
+        volatile += f"Tone detected: {tone}\n"
 
-        return (
-            language_rule + identity + personality_rules + thinking_rules +
+        prompt = (
+            language_rule + self._static_core +
             f"CURRENT TONE GUIDANCE:\n{tone_guidance}" +
-            chat_context + examples + current_time +
-            "Now respond naturally as yourself. Keep it real."
+            chat_context + self._examples +
+            "Now respond naturally as yourself. Keep it real.\n\n" +
+            volatile
         )
 
+        if len(self._prompt_cache) > 1024:
+            self._prompt_cache.clear()
+        self._prompt_cache[key] = (time_line, prompt)
+        return prompt
+
     def enhance_response(self, response: str, user_name: Optional[str] = None,
                          language: str = "en") -> str:
         try:
@@ -109,35 +192,27 @@ class PersonalityManager:
                 return response
 
             enhanced = response.strip()
-            enhanced = enhanced.replace("**", "").replace("*", "")
-
-            ai_phrases = [
-                "I'm an AI", "As an AI", "I'm here to help", "As a language model",
-                "I'm a chatbot", "I'm a bot", "I'm an assistant", "I'm designed to",
-                "My purpose is", "I was created to", "I'm programmed to",
-                "How can I assist", "Is there anything else", "I hope this helps",
-                "Let me know if you need", "I don't have feelings", "I can't experience",
-            ]
-            for phrase in ai_phrases:
-                if phrase.lower() in enhanced.lower():
-                    sentences = enhanced.split(". ")
-                    enhanced = ". ".join(s for s in sentences if phrase.lower() not in s.lower())
+            if "*" in enhanced:
+                enhanced = enhanced.replace("**", "").replace("*", "")
+
+            # Typical short replies already read naturally (they contain a
+            # contraction apostrophe and no assistant-speak) — skip the
+            # substitution passes entirely for those
+            if "'" in enhanced and not _AI_PHRASE_RE.search(enhanced):
+                return enhanced
+
+            if _AI_PHRASE_RE.search(enhanced):
+                sentences = _SENTENCE_RE.split(enhanced)
+                enhanced = " ".join(s for s in sentences if not _AI_PHRASE_RE.search(s))
 
             # Only apply English contractions for English text — never for Hindi/Arabic/etc.
             if language not in _NON_LATIN_SCRIPTS and language in ("en", ""):
-                contractions = {
-                    " do not ": " don't ", " does not ": " doesn't ",
-                    " did not ": " didn't ", " will not ": " won't ",
-                    " would not ": " wouldn't ", " could not ": " couldn't ",
-                    " cannot ": " can't ", " is not ": " isn't ", " are not ": " aren't ",
-                    " I am ": " I'm ", " you are ": " you're ", " it is ": " it's ",
-                }
-                for formal, casual in contractions.items():
-                    enhanced = enhanced.replace(formal, casual)
-                    enhanced = enhanced.replace(formal.title(), casual)
+                enhanced = _CONTRACTION_RE.sub(
+                    lambda m: _CONTRACTION_MAP[m.group(0)], enhanced
+                )
 
             return enhanced.strip()
 
         except Exception as e:
-            self.logger.error(f"Error enhancing response: {e}")
+            self.logger.error("Error enhancing response: %s", e)
             return response
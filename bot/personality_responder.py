@@ -1,8 +1,27 @@
-import random
+from random import random as _rand, choice as _choice
 import re
 import logging
 from typing import Optional
 
+# Question-shaped identity probes only. The direct path preempts Gemini,
+# so a bare keyword ("creator", "girlfriend") inside an ordinary sentence
+# must not trigger it — the broad substring lists in _identity_response
+# stay reserved for the LLM-failure fallback.
+_DIRECT_IDENTITY_RES = (
+    re.compile(r"\bwho\s+(?:are|r)\s+(?:you|u)\b"),
+    re.compile(r"\bwhat(?:'s|s|\s+is)?\s+(?:ur|your)\s+name\b"),
+    re.compile(r"\b(?:aapka|apka|apna|tera|tumhara)\s+naam\b"),
+    re.compile(r"\bnaam\s+kya\b"),
+    re.compile(r"\bwho\s+(?:made|created)\s+(?:you|u)\b"),
+    re.compile(r"\bwho(?:'s|s|\s+is)\s+(?:ur|your)\s+(?:owner|creator)\b"),
+    re.compile(r"\bowner\s+kaun\b"),
+    re.compile(r"\b(?:tumhe|tujhe|aapko)\s+kisne\b"),
+    re.compile(r"\bdo\s+(?:you|u)\s+have\s+a?\s*(?:girlfriend|gf)\b"),
+    re.compile(r"\bare\s+(?:you|u)\s+single\b"),
+    re.compile(r"\b(?:ur|your)\s+(?:girlfriend|gf)\b"),
+    re.compile(r"\b(?:owner|creator)\s+(?:ka\s+)?id\b"),
+)
+
 
 class PersonalityResponder:
     def __init__(self, bot_name="Junghwan", owner_name="@santit2020"):
@@ -27,10 +46,23 @@ class PersonalityResponder:
             self._general_response(tone, is_hindi)
         )
 
-        if user_name and random.random() < 0.35:
+        if user_name and _rand() < 0.35:
             response = self._add_name(response, user_name)
         return response
 
+    def get_direct_response(self, message, language="en"):
+        """Answers fixed by the persona (identity, devotional greetings).
+
+        These are verbatim per the system prompt, so callers can serve them
+        without an LLM round-trip. Only question-shaped probes qualify —
+        ordinary sentences that merely mention a keyword go to Gemini.
+        Returns None for everything else.
+        """
+        text = message.strip().lower()
+        if any(p.search(text) for p in _DIRECT_IDENTITY_RES):
+            return self._identity_response(text, language) or self._religion_response(text)
+        return self._religion_response(text)
+
     def _identity_response(self, text, language):
         name_triggers = [
             "what is ur name", "what's ur name", "what is your name",
@@ -84,46 +116,46 @@ class PersonalityResponder:
 
         if "morning" in text or text.strip() == "gm":
             if is_hindi:
-                return random.choice([
+                return _choice([
                     "Gm! Aaj ka din kaisa raha?",
                     "Subah subah! Kya chal raha hai?",
                 ])
-            return random.choice([
+            return _choice([
                 "Good morning! Hope your day's already looking good",
                 "Morning! Rise and shine, how's it going?",
             ])
 
         if "night" in text or text.strip() == "gn":
             if is_hindi:
-                return random.choice([
+                return _choice([
                     "Good night! Achi neend aana",
                     "Gn! Rest karo aache se",
                 ])
-            return random.choice([
+            return _choice([
                 "Good night! Sleep well",
                 "Night night! Take care",
             ])
 
         if "evening" in text:
             if is_hindi:
-                return random.choice([
+                return _choice([
                     "Good evening! Din kaisa gaya?",
                     "Evening! Kya chal raha hai?",
                 ])
-            return random.choice([
+            return _choice([
                 "Good evening! How was your day?",
                 "Evening! How's it going?",
             ])
 
         if is_hindi:
-            return random.choice([
+            return _choice([
                 "Hey! Kya haal hai?",
                 "Heyy! Kaisa chal raha hai?",
                 "Arey yaar, hi! Kya ho raha hai?",
                 "Yo! Sab theek?",
                 "Oye! Kaisa hai tu?",
             ])
-        return random.choice([
+        return _choice([
             "Hey! What's up?",
             "Heyy! How's it going?",
             "Hi there! What's on your mind?",
@@ -140,13 +172,13 @@ class PersonalityResponder:
             return None
 
         if is_hindi:
-            return random.choice([
+            return _choice([
                 "Bye! Jaldi wapas aana",
                 "Alvida yaar! Dhyan rakhna",
                 "Okay baad mein milte hain!",
                 "Bye bye! Baat karna accha laga",
             ])
-        return random.choice([
+        return _choice([
             "Bye! Come back soon",
             "See ya! Take care",
             "Later! Don't be a stranger",
@@ -165,23 +197,23 @@ class PersonalityResponder:
 
         if tone == "sad":
             if is_hindi:
-                return random.choice([
+                return _choice([
                     "Main theek hoon, par zyada important — tu kaisa hai? Kuch pareshan lag raha hai",
                     "Theek hoon main! Par tu? Kuch toh hai... bol na",
                 ])
-            return random.choice([
+            return _choice([
                 "I'm good! But more importantly, how are YOU? You seem a bit off",
                 "Doing fine! But you okay? You seem a little down",
             ])
 
         if is_hindi:
-            return random.choice([
+            return _choice([
                 "Mast hoon! Tu bata kaisa hai?",
                 "Ekdum theek! Aur tu?",
                 "Bindaas hoon yaar, tu bata",
                 "Achi feeling hai! Tu kya kar raha hai aajkal?",
             ])
-        return random.choice([
+        return _choice([
             "I'm doing great actually! What about you?",
             "Pretty good ngl! How are you?",
             "Good vibes only over here, you?",
@@ -200,12 +232,12 @@ class PersonalityResponder:
             return None
 
         if is_hindi:
-            return random.choice([
+            return _choice([
                 "Aww yaar seriously, tu bhi bahut acha hai!",
                 "Haha stop it! Seriously, shukriya",
                 "Yeh sun ke dil khush ho gaya! Tu bhi!",
             ])
-        return random.choice([
+        return _choice([
             "Aww that actually made me smile, you're pretty cool too!",
             "Haha stop it you, but seriously, thank you!",
             "That's so sweet! You just made my day honestly",
@@ -222,13 +254,13 @@ class PersonalityResponder:
             return None
 
         if is_hindi:
-            return random.choice([
+            return _choice([
                 "Kya hua yaar? Bata mujhe",
                 "Arre yaar, kya baat hai? Main sun raha hoon",
                 "Bata, sab sun raha hoon",
                 "Main yahan hoon theek hai? Kya ho raha hai?",
             ])
-        return random.choice([
+        return _choice([
             "Hey, what happened? Talk to me",
             "Aw no, what's wrong? I'm here",
             "Tell me everything. I'm listening",
@@ -244,11 +276,11 @@ class PersonalityResponder:
             return None
 
         if is_hindi:
-            return random.choice([
+            return _choice([
                 "Main sirf tere liye hoon — yeh kafi nahi kya?",
                 "Haha tu bhi na, par main hamesha tere liye hoon!",
             ])
-        return random.choice([
+        return _choice([
             "You know, I'm here only for you, that counts for something!",
             "Haha you're something else, but I'm always here for you!",
         ])
@@ -272,11 +304,11 @@ class PersonalityResponder:
             return None
 
         if is_hindi:
-            return random.choice([
+            return _choice([
                 "Accha sawaal hai yaar, mujhe thoda sochna padega — abhi network thoda slow hai, retry kar!",
                 "Hmm interesting! Abhi main fully process nahi kar pa raha — ek baar phir try kar yaar",
             ])
-        return random.choice([
+        return _choice([
             "That's a genuinely interesting question — give me a sec, I might be slow right now. Try again!",
             "Hmm! I want to actually think about this properly — try sending again in a moment?",
         ])
@@ -284,39 +316,39 @@ class PersonalityResponder:
     def _general_response(self, tone, is_hindi):
         if tone == "excited":
             if is_hindi:
-                return random.choice([
+                return _choice([
                     "Oye! Itni energy kahan se aa rahi hai bata kya hua!",
                     "Haha waah! Kya chal raha hai??",
                 ])
-            return random.choice([
+            return _choice([
                 "Haha okay I feel the energy! Tell me more",
                 "Oh wow, you're excited! I like it, what's going on?",
             ])
 
         if tone == "formal":
             if is_hindi:
-                return random.choice([
+                return _choice([
                     "Theek hai, samajh gaya. Aur batao?",
                     "Haan, sahi keh rahe ho. Aage bolo?",
                 ])
-            return random.choice([
+            return _choice([
                 "That's an interesting point. What are your thoughts on it?",
                 "I get what you're saying. Go on?",
             ])
 
         if tone == "angry":
             if is_hindi:
-                return random.choice([
+                return _choice([
                     "Yaar, relax! Kya hua bata mujhe",
                     "Ek saans lo! Kya ho gaya? Main sun raha hoon",
                 ])
-            return random.choice([
+            return _choice([
                 "Whoa, you seem a bit heated, what happened?",
                 "Hey, take a breath! What's going on?",
             ])
 
         if is_hindi:
-            return random.choice([
+            return _choice([
                 "Haha sach mein? aur bata!",
                 "Yaar ye toh interesting hai! Zyada bol",
                 "Oho! Aisa? Phir kya hua?",
@@ -326,7 +358,7 @@ class PersonalityResponder:
                 "Hmm soch raha hoon, haan carry on",
             ])
 
-        return random.choice([
+        return _choice([
             "haha yeah for real, what else?",
             "That's actually interesting ngl! Say more?",
             "Hmm, true. What do you think about it?",
@@ -340,7 +372,7 @@ class PersonalityResponder:
         ])
 
     def _add_name(self, response, user_name):
-        return random.choice([
+        return _choice([
             user_name + ", " + response[0].lower() + response[1:],
             "Hey " + user_name + "! " + response,
         ])
@@ -3,6 +3,7 @@ import asyncio
 from typing import Optional
 from aiogram import Bot, Dispatcher
 from aiogram.client.default import DefaultBotProperties
+from aiogram.client.session.aiohttp import AiohttpSession
 from aiogram.enums import ParseMode
 from aiogram.exceptions import TelegramAPIError
 
@@ -26,8 +27,29 @@ class TelegramBot:
             link_preview_is_disabled=True
         )
 
+        # One shared session with a pooled connector — all traffic hits
+        # api.telegram.org, so kept-alive sockets amortize TLS handshakes
+        # across broadcast sends instead of reconnecting per message.
+        # _connector_init is private aiogram API (no public hook for
+        # connector kwargs); if a release reshapes it, run with the stock
+        # connector rather than failing startup
+        session = AiohttpSession()
+        connector_init = getattr(session, "_connector_init", None)
+        if isinstance(connector_init, dict):
+            connector_init.update(
+                limit=50,
+                limit_per_host=50,
+                ttl_dns_cache=300,
+                keepalive_timeout=75
+            )
+        else:
+            self.logger.warning(
+                "AiohttpSession._connector_init unavailable — using aiogram's default connector"
+            )
+
         self.bot = Bot(
             token=settings.TELEGRAM_BOT_TOKEN,
+            session=session,
             default=default_properties
         )
 
@@ -60,12 +82,19 @@ class TelegramBot:
     async def start_polling(self):
         """Start the bot with polling."""
         try:
-            bot_info = await self.bot.get_me()
+            # Validate the Telegram token and warm up the Gemini connection
+            # concurrently instead of paying both round-trips in sequence
+            bot_info, gemini_ok = await asyncio.gather(
+                self.bot.get_me(),
+                self.gemini_client.test_connection()
+            )
             self.logger.info(f"Bot started: @{bot_info.username} ({bot_info.full_name})")
+            if not gemini_ok:
+                self.logger.warning("Gemini warm-up failed — local responses will be used until it recovers")
 
             await self.dp.start_polling(
                 self.bot,
-                allowed_updates=['message', 'callback_query', 'chat_member'],
+                allowed_updates=list(self.settings.ALLOWED_UPDATES),
                 drop_pending_updates=True
             )
 
@@ -80,6 +109,7 @@ class TelegramBot:
         """Gracefully stop the bot."""
         try:
             await self.dp.stop_polling()
+            self.user_manager.flush()
             await self.bot.session.close()
             self.logger.info("Bot stopped gracefully")
         except Exception as e:
@@ -91,8 +121,9 @@ class TelegramBot:
             await self.bot.send_message(chat_id=chat_id, text=text, **kwargs)
             return True
         except TelegramAPIError as e:
-            self.logger.warning(f"Failed to send message to {chat_id}: {e}")
+            # %-style args so formatting is skipped when the level is filtered
+            self.logger.warning("Failed to send message to %s: %s", chat_id, e)
             return False
         except Exception as e:
-            self.logger.error(f"Unexpected error sending message to {chat_id}: {e}")
+            self.logger.error("Unexpected error sending message to %s: %s", chat_id, e)
             return False
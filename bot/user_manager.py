@@ -1,10 +1,23 @@
+import asyncio
 import logging
 import json
 import os
-from typing import Dict, List, Optional, Set
+import time
+from typing import AsyncIterator, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from aiogram.types import User, Chat
 
+
+def _as_epoch(value, default: float = 0.0) -> float:
+    """Read a stored timestamp that may be an epoch number or a legacy ISO string."""
+    if isinstance(value, (int, float)):
+        return value
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except (TypeError, ValueError):
+        return default
+
+
 class UserManager:
     """Manages user and chat data with persistent storage."""
     
@@ -16,7 +29,13 @@ class UserManager:
         self.users: Dict[int, Dict] = {}
         self.chats: Dict[int, Dict] = {}
         self.user_activity: Dict[int, datetime] = {}
-        
+
+        # Debounced persistence — updates mark the store dirty and a single
+        # delayed flush coalesces a whole burst into one file rewrite
+        self._dirty = False
+        self._flush_handle = None
+        self._flush_delay = 0.5
+
         # Load existing data
         self._load_data()
         
@@ -40,8 +59,10 @@ class UserManager:
                 "username": user.username,
                 "language_code": user.language_code,
                 "is_bot": user.is_bot,
-                "first_seen": self.users.get(user_id, {}).get("first_seen", datetime.now().isoformat()),
-                "last_seen": datetime.now().isoformat(),
+                # Epoch seconds — compared as plain numbers in get_stats
+                # instead of being re-parsed from ISO strings
+                "first_seen": self.users.get(user_id, {}).get("first_seen", int(time.time())),
+                "last_seen": int(time.time()),
                 "message_count": self.users.get(user_id, {}).get("message_count", 0) + 1
             }
             
@@ -50,9 +71,9 @@ class UserManager:
             
             # Update activity
             self.user_activity[user_id] = datetime.now()
-            
-            # Save to file
-            self._save_data()
+
+            # Save to file (debounced)
+            self._schedule_save()
             
             self.logger.debug(f"Registered user {user_id} in chat {chat_id}")
             
@@ -70,12 +91,12 @@ class UserManager:
                 "title": getattr(chat, 'title', None),
                 "username": getattr(chat, 'username', None),
                 "description": getattr(chat, 'description', None),
-                "first_added": self.chats.get(chat_id, {}).get("first_added", datetime.now().isoformat()),
-                "last_activity": datetime.now().isoformat(),
+                "first_added": self.chats.get(chat_id, {}).get("first_added", int(time.time())),
+                "last_activity": int(time.time()),
                 "is_active": True
             }
             
-            self._save_data()
+            self._schedule_save()
             self.logger.debug(f"Registered chat {chat_id} ({chat.type})")
             
         except Exception as e:
@@ -86,12 +107,32 @@ class UserManager:
         try:
             if chat_id in self.chats:
                 self.chats[chat_id]["is_active"] = False
-                self.chats[chat_id]["removed_date"] = datetime.now().isoformat()
-                self._save_data()
+                self.chats[chat_id]["removed_date"] = int(time.time())
+                self._schedule_save()
                 self.logger.info(f"Removed chat {chat_id}")
             
         except Exception as e:
             self.logger.error(f"Error removing chat {chat_id}: {e}")
+
+    async def remove_chats(self, chat_ids: List[int]):
+        """Remove many chats at once with a single persistence write."""
+        try:
+            removed_date = int(time.time())
+            removed = 0
+
+            for chat_id in chat_ids:
+                chat = self.chats.get(chat_id)
+                if chat:
+                    chat["is_active"] = False
+                    chat["removed_date"] = removed_date
+                    removed += 1
+
+            if removed:
+                self._schedule_save()
+                self.logger.info(f"Removed {removed} chats in bulk")
+
+        except Exception as e:
+            self.logger.error(f"Error bulk-removing chats: {e}")
     
     async def get_user(self, user_id: int) -> Optional[Dict]:
         """Get user data by ID."""
@@ -108,6 +149,26 @@ class UserManager:
     async def get_all_chats(self) -> List[Dict]:
         """Get all active chats."""
         return [chat for chat in self.chats.values() if chat.get("is_active", True)]
+
+    async def iter_chats(self, target_type: str = "all") -> AsyncIterator[Tuple[int, str]]:
+        """Stream (chat_id, chat_type) for active chats matching target_type."""
+        for chat in self.chats.values():
+            if not chat.get("is_active", True):
+                continue
+
+            chat_id = chat.get("chat_id")
+            if not chat_id:
+                continue
+
+            chat_type = chat.get("chat_type", "private")
+
+            # Filter based on target type
+            if target_type == "users" and chat_type != "private":
+                continue
+            elif target_type == "groups" and chat_type == "private":
+                continue
+
+            yield chat_id, chat_type
     
     async def get_stats(self) -> Dict:
         """Get user and chat statistics."""
@@ -129,8 +190,9 @@ class UserManager:
             active_today = len([uid for uid, last_activity in self.user_activity.items()
                               if last_activity.date() == today])
             
+            week_ago_epoch = week_ago.timestamp()
             new_this_week = len([u for u in self.users.values()
-                               if datetime.fromisoformat(u.get("first_seen", now.isoformat())) > week_ago])
+                               if _as_epoch(u.get("first_seen"), now.timestamp()) > week_ago_epoch])
             
             return {
                 "total_users": total_users,
@@ -159,8 +221,34 @@ class UserManager:
         # Update message count
         if user_id in self.users:
             self.users[user_id]["message_count"] = self.users[user_id].get("message_count", 0) + 1
-            self.users[user_id]["last_seen"] = datetime.now().isoformat()
+            self.users[user_id]["last_seen"] = int(time.time())
+
+        # Debounced, so per-message persistence stays one write per burst
+        self._schedule_save()
     
+    def _schedule_save(self):
+        """Mark the store dirty and arm a delayed flush if none is pending."""
+        self._dirty = True
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_event_loop().call_later(
+                self._flush_delay, self._flush
+            )
+
+    def _flush(self):
+        self._flush_handle = None
+        if self._dirty:
+            self._dirty = False
+            self._save_data()
+
+    def flush(self):
+        """Write any pending changes immediately (shutdown path)."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._dirty:
+            self._dirty = False
+            self._save_data()
+
     def _load_data(self):
         """Load user and chat data from file."""
         try:
@@ -206,48 +294,33 @@ class UserManager:
                 "user_activity": activity_data,
                 "last_updated": datetime.now().isoformat()
             }
-            
-            # Create backup of existing file
-            if os.path.exists(self.data_file):
-                backup_file = f"{self.data_file}.backup"
-                os.rename(self.data_file, backup_file)
-            
-            # Write new data
-            with open(self.data_file, 'w', encoding='utf-8') as f:
+
+            # Write to a temp file and atomically swap it in — the canonical
+            # file always exists and is always complete, with no backup dance
+            tmp_file = f"{self.data_file}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
                 json.dump(data, f, indent=2, ensure_ascii=False)
-            
-            # Remove backup on successful write
-            backup_file = f"{self.data_file}.backup"
-            if os.path.exists(backup_file):
-                os.remove(backup_file)
-                
+            os.replace(tmp_file, self.data_file)
+
         except Exception as e:
             self.logger.error(f"Error saving data: {e}")
-            
-            # Restore backup if write failed
-            backup_file = f"{self.data_file}.backup"
-            if os.path.exists(backup_file):
-                os.rename(backup_file, self.data_file)
     
     async def cleanup_inactive_chats(self, days: int = 30):
         """Remove chats that have been inactive for specified days."""
         try:
-            cutoff = datetime.now() - timedelta(days=days)
+            cutoff_epoch = time.time() - days * 86400
             removed_count = 0
-            
+
             for chat_id, chat_data in list(self.chats.items()):
                 last_activity = chat_data.get("last_activity")
                 if last_activity:
-                    try:
-                        last_active = datetime.fromisoformat(last_activity)
-                        if last_active < cutoff:
-                            chat_data["is_active"] = False
-                            removed_count += 1
-                    except:
-                        pass  # Skip invalid dates
+                    last_active = _as_epoch(last_activity)
+                    if last_active and last_active < cutoff_epoch:
+                        chat_data["is_active"] = False
+                        removed_count += 1
             
             if removed_count > 0:
-                self._save_data()
+                self._schedule_save()
                 self.logger.info(f"Marked {removed_count} chats as inactive")
             
             return removed_count
@@ -8,10 +8,50 @@ DetectorFactory.seed = 0
 
 logger = logging.getLogger(__name__)
 
+# All tone indicators fused into one alternation with a named group per
+# category — detect_tone makes a single pass over the message and tallies
+# match.lastgroup, instead of scanning the text once per pattern. Word
+# indicators come before punctuation so e.g. '...' counts as sad rather
+# than falling through to a weaker class.
+_TONE_RE = re.compile(
+    r'(?P<formal>(?i:\b(?:sir|madam|please|kindly|would you|could you|may i'
+    r'|thank you very much|i would appreciate|i am writing to'
+    r'|furthermore|however|nevertheless|therefore)\b))'
+    r'|(?P<casual>(?i:\b(?:lol|haha|omg|wtf|tbh|ngl|btw|imo|afaik'
+    r'|yeah|yep|nah|gonna|wanna|gotta)\b)|!{2,}|\?{2,})'
+    r'|(?P<sad>(?i:\b(?:sad|sorry|worried|concerned|upset|disappointed)\b)|\.{3,})'
+    r'|(?P<angry>(?i:\b(?:angry|mad|furious|hate|stupid|idiot|damn)\b)|[@#$%^&*])'
+    r'|(?P<excited>(?i:\b(?:awesome|amazing|fantastic|great|love|excited|yay)\b)'
+    r'|[A-Z]{3,}|!)'
+)
+
+_WS_RE = re.compile(r'\s+')
+_EXCESS_EXCLAIM_RE = re.compile(r'[!]{3,}')
+_EXCESS_QUESTION_RE = re.compile(r'[?]{3,}')
+_EXCESS_DOTS_RE = re.compile(r'[.]{4,}')
+
+def _script_guess(text: str) -> str:
+    """Guess a language from Unicode script ranges — no model involved."""
+    for ch in text[:64]:
+        cp = ord(ch)
+        if 0xAC00 <= cp <= 0xD7AF or 0x1100 <= cp <= 0x11FF:
+            return "ko"
+        if 0x3040 <= cp <= 0x30FF:
+            return "ja"
+        if 0x4E00 <= cp <= 0x9FFF:
+            return "zh"
+        if 0x0400 <= cp <= 0x04FF:
+            return "ru"
+        if 0x0600 <= cp <= 0x06FF:
+            return "ar"
+        if 0x0900 <= cp <= 0x097F:
+            return "hi"
+    return "en"
+
 def detect_language_and_tone(text: str) -> Tuple[str, str]:
     """
     Detect language and tone from text.
-    
+
     Returns:
         Tuple of (language_code, tone)
     """
@@ -19,15 +59,19 @@ def detect_language_and_tone(text: str) -> Tuple[str, str]:
         # Default values
         language = "en"
         tone = "casual"
-        
-        # Detect language
-        try:
-            detected_lang = detect(text)
-            if detected_lang:
-                language = detected_lang
-        except:
-            # Fallback to English if detection fails
-            language = "en"
+
+        # Detect language. langdetect's n-gram model is both slow and
+        # unreliable on very short texts — use the script ranges instead.
+        if len(text) < 20:
+            language = _script_guess(text)
+        else:
+            try:
+                detected_lang = detect(text)
+                if detected_lang:
+                    language = detected_lang
+            except:
+                # Fallback to English if detection fails
+                language = "en"
         
         # Detect tone through pattern analysis
         tone = detect_tone(text)
@@ -46,56 +90,19 @@ def detect_tone(text: str) -> str:
         Tone identifier: formal, casual, excited, sad, angry, etc.
     """
     try:
-        text_lower = text.lower()
-        
-        # Formal indicators
-        formal_patterns = [
-            r'\b(sir|madam|please|kindly|would you|could you|may i)\b',
-            r'\b(thank you very much|i would appreciate|i am writing to)\b',
-            r'\b(furthermore|however|nevertheless|therefore)\b'
-        ]
-        
-        # Casual indicators
-        casual_patterns = [
-            r'\b(lol|haha|omg|wtf|tbh|ngl|btw|imo|afaik)\b',
-            r'\b(yeah|yep|nah|gonna|wanna|gotta)\b',
-            r'[!]{2,}|[?]{2,}',  # Multiple punctuation
-        ]
-        
-        # Excited indicators
-        excited_patterns = [
-            r'[!]{1,}',
-            r'\b(awesome|amazing|fantastic|great|love|excited|yay)\b',
-            r'[A-Z]{3,}',  # CAPS
-        ]
-        
-        # Sad/concerned indicators
-        sad_patterns = [
-            r'\b(sad|sorry|worried|concerned|upset|disappointed)\b',
-            r'[.]{3,}',  # Ellipsis
-        ]
-        
-        # Angry indicators
-        angry_patterns = [
-            r'\b(angry|mad|furious|hate|stupid|idiot|damn)\b',
-            r'[!@#$%^&*]',  # Special characters
-        ]
-        
-        # Count pattern matches
-        formal_score = sum(len(re.findall(pattern, text_lower)) for pattern in formal_patterns)
-        casual_score = sum(len(re.findall(pattern, text_lower)) for pattern in casual_patterns)
-        excited_score = sum(len(re.findall(pattern, text_lower)) for pattern in excited_patterns)
-        sad_score = sum(len(re.findall(pattern, text_lower)) for pattern in sad_patterns)
-        angry_score = sum(len(re.findall(pattern, text_lower)) for pattern in angry_patterns)
-        
-        # Determine dominant tone
+        if not text:
+            return "casual"
+
+        # One pass over the text; each match is credited to its category
         scores = {
-            "formal": formal_score,
-            "casual": casual_score,
-            "excited": excited_score,
-            "sad": sad_score,
-            "angry": angry_score
+            "formal": 0,
+            "casual": 0,
+            "excited": 0,
+            "sad": 0,
+            "angry": 0
         }
+        for m in _TONE_RE.finditer(text):
+            scores[m.lastgroup] += 1
         
         # Get highest scoring tone
         max_score = max(scores.values())
@@ -114,12 +121,12 @@ def clean_text(text: str) -> str:
     """Clean and normalize text."""
     try:
         # Remove excessive whitespace
-        text = re.sub(r'\s+', ' ', text)
-        
+        text = _WS_RE.sub(' ', text)
+
         # Remove excessive punctuation
-        text = re.sub(r'[!]{3,}', '!!', text)
-        text = re.sub(r'[?]{3,}', '??', text)
-        text = re.sub(r'[.]{4,}', '...', text)
+        text = _EXCESS_EXCLAIM_RE.sub('!!', text)
+        text = _EXCESS_QUESTION_RE.sub('??', text)
+        text = _EXCESS_DOTS_RE.sub('...', text)
         
         return text.strip()
         
@@ -136,24 +143,20 @@ def format_message_for_chat(message: str, chat_type: str) -> str:
         else:
             # Group chats should be more concise
             if len(message) > 500:
-                # Truncate long messages in groups
-                sentences = message.split('. ')
-                truncated = []
-                char_count = 0
-                
-                for sentence in sentences:
-                    if char_count + len(sentence) > 400:
+                # Walk sentence boundaries directly — no need to materialize
+                # a full sentence list for a message we cut at 400 chars
+                cut = 0
+                while True:
+                    boundary = message.find('. ', cut)
+                    if boundary == -1 or boundary >= 400:
                         break
-                    truncated.append(sentence)
-                    char_count += len(sentence)
-                
-                if truncated:
-                    message = '. '.join(truncated)
-                    if not message.endswith('.'):
-                        message += '.'
+                    cut = boundary + 2
+
+                if cut:
+                    message = message[:cut - 1]  # keep the period, drop the space
                 else:
                     message = message[:400] + "..."
-            
+
             return message
             
     except Exception as e:
@@ -172,15 +175,24 @@ def extract_command_args(text: str) -> Tuple[str, str]:
         logger.error(f"Error extracting command args: {e}")
         return text, ""
 
+# Compiled @username patterns keyed by username — the username is constant
+# per bot, so neither the needle nor a lowercase copy of the message should
+# be rebuilt on every call
+_MENTION_PATTERNS = {}
+
 def is_mention(text: str, bot_username: str) -> bool:
     """Check if text contains a mention of the bot."""
     try:
         if not bot_username:
             return False
-        
-        mention_pattern = f"@{bot_username.lower()}"
-        return mention_pattern in text.lower()
-        
+
+        pattern = _MENTION_PATTERNS.get(bot_username)
+        if pattern is None:
+            pattern = _MENTION_PATTERNS.setdefault(
+                bot_username, re.compile(re.escape(f"@{bot_username}"), re.IGNORECASE)
+            )
+        return pattern.search(text) is not None
+
     except Exception as e:
         logger.error(f"Error checking mention: {e}")
         return False
@@ -202,14 +214,15 @@ def truncate_text(text: str, max_length: int = 100) -> str:
     try:
         if len(text) <= max_length:
             return text
-        
-        truncated = text[:max_length-3]
-        last_space = truncated.rfind(' ')
-        
+
+        # Find the break point on indices first, then slice exactly once
+        cut = max_length - 3
+        last_space = text.rfind(' ', 0, cut)
+
         if last_space > max_length * 0.7:  # If we can find a good break point
-            truncated = truncated[:last_space]
-        
-        return truncated + "..."
+            cut = last_space
+
+        return text[:cut] + "..."
         
     except Exception as e:
         logger.error(f"Error truncating text: {e}")
@@ -1,59 +1,146 @@
 import os
 import logging
+from types import MappingProxyType
+from typing import NamedTuple
 from dotenv import load_dotenv
 
 load_dotenv()
 
+# Bound once at import — getLogger takes the logging manager's lock on
+# every call even for an existing logger
+_LOGGER = logging.getLogger(__name__)
 
-class Settings:
-    def __init__(self):
-        self.logger = logging.getLogger(__name__)
-
-        # Required
-        self.TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-        self.GEMINI_API_KEY = os.getenv("GEMINI_API_KEY")
-
-        # Bot Identity
-        self.BOT_NAME = os.getenv("BOT_NAME", "Junghwan")
-        self.BOT_USERNAME = os.getenv("BOT_USERNAME", "")
-        self.BOT_OWNER_NAME = os.getenv("BOT_OWNER_NAME", "@santit2020")
-        self.BOT_OWNER_ID = int(os.getenv("BOT_OWNER_ID", "123456789"))
-        self.GR_NAME = os.getenv("GR_NAME", "Tech Group")
-        self.BOT_PERSONALITY = os.getenv("BOT_PERSONALITY", "friendly and natural conversationalist")
-
-        # Conversation Settings
-        self.MAX_CONTEXT_MESSAGES = int(os.getenv("MAX_CONTEXT_MESSAGES", "30"))
-        # Increased from 2h → 4h so context survives longer gaps
-        self.CONTEXT_TIMEOUT_HOURS = int(os.getenv("CONTEXT_TIMEOUT_HOURS", "4"))
-        self.RATE_LIMIT_MESSAGES = int(os.getenv("RATE_LIMIT_MESSAGES", "999999"))
-
-        # AI Model — upgraded from gemini-2.0-flash-lite to gemini-2.0-flash
-        # gemini-2.0-flash has much stronger reasoning and multilingual capability.
-        # Use gemini-1.5-flash as a fallback if 2.0-flash is unavailable in your region.
-        self.GEMINI_MODEL = os.getenv("GEMINI_MODEL", "gemini-2.0-flash")
-        self.AI_TEMPERATURE = float(os.getenv("AI_TEMPERATURE", "0.92"))
-        self.AI_TOP_P = float(os.getenv("AI_TOP_P", "0.95"))
-        self.AI_TOP_K = int(os.getenv("AI_TOP_K", "64"))
-        # Max tokens increased — 300 was too small for any thoughtful answer
-        self.AI_MAX_TOKENS = int(os.getenv("AI_MAX_TOKENS", "800"))
+# Shared immutable constant — one allocation per process, safe to hand to
+# aiogram without defensive copies
+_ALLOWED_UPDATES = ("message", "callback_query", "chat_member")
 
-        # Group Chat Settings
-        self.GROUP_MAX_MESSAGE_LENGTH = int(os.getenv("GROUP_MAX_MESSAGE_LENGTH", "400"))
 
-        # Logging
-        self.LOG_LEVEL = os.getenv("LOG_LEVEL", "INFO").upper()
+class OwnerInfo(NamedTuple):
+    """Immutable owner summary — built once per Settings, fields read by name."""
+    owner_id: int
+    owner_name: str
+    bot_name: str
+    group_name: str
+    is_configured: bool
 
-        # Deployment
-        self.PORT = int(os.getenv("PORT", "8000"))
-        self.HEALTH_CHECK_INTERVAL = int(os.getenv("HEALTH_CHECK_INTERVAL", "30"))
 
-        # Data Storage
-        self.DATA_FILE = os.getenv("DATA_FILE", "user_data.json")
-        self.BACKUP_INTERVAL_HOURS = int(os.getenv("BACKUP_INTERVAL_HOURS", "24"))
+class Settings:
+    # Fixed slots instead of a per-instance __dict__ — attribute reads on
+    # the message hot path (BOT_OWNER_ID, GEMINI_MODEL, ...) become direct
+    # offset loads and the instance shrinks accordingly
+    __slots__ = (
+        "logger",
+        "TELEGRAM_BOT_TOKEN", "GEMINI_API_KEY",
+        "BOT_NAME", "BOT_USERNAME", "BOT_OWNER_NAME", "BOT_OWNER_ID",
+        "GR_NAME", "BOT_PERSONALITY",
+        "MAX_CONTEXT_MESSAGES", "CONTEXT_TIMEOUT_HOURS", "RATE_LIMIT_MESSAGES",
+        "GEMINI_MODEL", "AI_TEMPERATURE", "AI_TOP_P", "AI_TOP_K", "AI_MAX_TOKENS",
+        "GROUP_MAX_MESSAGE_LENGTH",
+        "LOG_LEVEL",
+        "PORT", "HEALTH_CHECK_INTERVAL",
+        "DATA_FILE", "BACKUP_INTERVAL_HOURS",
+        "MAX_FILE_SIZE_MB",
+        "_owner_ids", "_owner_info", "_bot_info", "_ai_config", "_conversation_config",
+    )
+
+    # Class-level: not env-configurable, shared by every instance with no
+    # per-instance slot. A tuple, not a frozenset — aiogram wants a sequence.
+    ALLOWED_UPDATES = _ALLOWED_UPDATES
+
+    # Env fields by target type, walked in one loop each — defaults (and
+    # why they changed) live here rather than inline in __init__
+    _STR_FIELDS = (
+        # Required — no defaults, validate() rejects missing values
+        ("TELEGRAM_BOT_TOKEN", None),
+        ("GEMINI_API_KEY", None),
+        # Bot identity
+        ("BOT_NAME", "Junghwan"),
+        ("BOT_USERNAME", ""),
+        ("BOT_OWNER_NAME", "@santit2020"),
+        ("GR_NAME", "Tech Group"),
+        ("BOT_PERSONALITY", "friendly and natural conversationalist"),
+        # AI model — upgraded from gemini-2.0-flash-lite to gemini-2.0-flash
+        # for much stronger reasoning and multilingual capability; use
+        # gemini-1.5-flash as a fallback if 2.0-flash is region-locked
+        ("GEMINI_MODEL", "gemini-2.0-flash"),
+        # Data storage
+        ("DATA_FILE", "user_data.json"),
+    )
+    _INT_FIELDS = (
+        ("BOT_OWNER_ID", "123456789"),
+        # Conversation settings — timeout increased from 2h → 4h so context
+        # survives longer gaps
+        ("MAX_CONTEXT_MESSAGES", "30"),
+        ("CONTEXT_TIMEOUT_HOURS", "4"),
+        ("RATE_LIMIT_MESSAGES", "999999"),
+        ("AI_TOP_K", "64"),
+        # Max tokens increased — 300 was too small for any thoughtful answer
+        ("AI_MAX_TOKENS", "800"),
+        ("GROUP_MAX_MESSAGE_LENGTH", "400"),
+        # Deployment
+        ("PORT", "8000"),
+        ("HEALTH_CHECK_INTERVAL", "30"),
+        ("BACKUP_INTERVAL_HOURS", "24"),
+        ("MAX_FILE_SIZE_MB", "20"),
+    )
+    _FLOAT_FIELDS = (
+        ("AI_TEMPERATURE", "0.92"),
+        ("AI_TOP_P", "0.95"),
+    )
 
-        # Security
-        self.ALLOWED_UPDATES = ["message", "callback_query", "chat_member"]
-        self.MAX_FILE_SIZE_MB = int(os.getenv("MAX_FILE_SIZE_MB", "20"))
+    def __init__(self):
+        self.logger = _LOGGER
+
+        # One bound lookup instead of ~20 os.getenv frames — same values,
+        # fewer attribute lookups per boot
+        env = os.environ
+
+        for name, default in self._STR_FIELDS:
+            setattr(self, name, env.get(name, default))
+        for name, default in self._INT_FIELDS:
+            setattr(self, name, int(env.get(name, default)))
+        for name, default in self._FLOAT_FIELDS:
+            setattr(self, name, float(env.get(name, default)))
+
+        # Fields with post-processing stay explicit
+        self.LOG_LEVEL = env.get("LOG_LEVEL", "INFO").upper()
+
+        # Single-member today, but is_owner checks membership so granting
+        # co-owners later is a one-line change
+        self._owner_ids = frozenset((self.BOT_OWNER_ID,))
+
+        # Info views are derived from immutable fields — build them once
+        # instead of allocating per accessor call, and hand out read-only
+        # objects so callers can't mutate the shared copies
+        self._owner_info = OwnerInfo(
+            owner_id=self.BOT_OWNER_ID,
+            owner_name=self.BOT_OWNER_NAME,
+            bot_name=self.BOT_NAME,
+            group_name=self.GR_NAME,
+            is_configured=self.BOT_OWNER_ID != 123456789,
+        )
+        self._bot_info = MappingProxyType({
+            "name": self.BOT_NAME,
+            "username": self.BOT_USERNAME,
+            "owner": self.BOT_OWNER_NAME,
+            "group": self.GR_NAME,
+            "personality": self.BOT_PERSONALITY,
+            "model": self.GEMINI_MODEL,
+            "version": "2.1.0",
+        })
+        self._ai_config = MappingProxyType({
+            "model": self.GEMINI_MODEL,
+            "temperature": self.AI_TEMPERATURE,
+            "top_p": self.AI_TOP_P,
+            "top_k": self.AI_TOP_K,
+            "max_tokens": self.AI_MAX_TOKENS,
+        })
+        self._conversation_config = MappingProxyType({
+            "max_context_messages": self.MAX_CONTEXT_MESSAGES,
+            "context_timeout_hours": self.CONTEXT_TIMEOUT_HOURS,
+            "rate_limit_messages": self.RATE_LIMIT_MESSAGES,
+            "group_max_message_length": self.GROUP_MAX_MESSAGE_LENGTH,
+        })
 
         self.logger.info("Settings initialized successfully")
 
@@ -76,44 +163,34 @@ class Settings:
         self.logger.info("Configuration validation passed")
 
     def is_owner(self, user_id: int) -> bool:
-        return user_id == self.BOT_OWNER_ID
+        return user_id in self._owner_ids
 
-    def get_owner_info(self) -> dict:
-        return {
-            "owner_id": self.BOT_OWNER_ID,
-            "owner_name": self.BOT_OWNER_NAME,
-            "bot_name": self.BOT_NAME,
-            "group_name": self.GR_NAME,
-            "is_configured": self.BOT_OWNER_ID != 123456789,
-        }
+    def get_owner_info(self) -> OwnerInfo:
+        return self._owner_info
 
     def get_bot_info(self) -> dict:
-        return {
-            "name": self.BOT_NAME,
-            "username": self.BOT_USERNAME,
-            "owner": self.BOT_OWNER_NAME,
-            "group": self.GR_NAME,
-            "personality": self.BOT_PERSONALITY,
-            "model": self.GEMINI_MODEL,
-            "version": "2.1.0",
-        }
+        return self._bot_info
 
     def get_ai_config(self) -> dict:
-        return {
-            "model": self.GEMINI_MODEL,
-            "temperature": self.AI_TEMPERATURE,
-            "top_p": self.AI_TOP_P,
-            "top_k": self.AI_TOP_K,
-            "max_tokens": self.AI_MAX_TOKENS,
-        }
+        return self._ai_config
 
     def get_conversation_config(self) -> dict:
-        return {
-            "max_context_messages": self.MAX_CONTEXT_MESSAGES,
-            "context_timeout_hours": self.CONTEXT_TIMEOUT_HOURS,
-            "rate_limit_messages": self.RATE_LIMIT_MESSAGES,
-            "group_max_message_length": self.GROUP_MAX_MESSAGE_LENGTH,
-        }
+        return self._conversation_config
 
     def __str__(self):
         return f"Settings(bot_name={self.BOT_NAME}, owner={self.BOT_OWNER_NAME}, model={self.GEMINI_MODEL})"
+
+
+_settings_instance = None
+
+
+def get_settings() -> Settings:
+    """Return the shared Settings instance, creating it on first use.
+
+    Settings are read from the environment once per process — callers should
+    use this instead of constructing Settings() repeatedly.
+    """
+    global _settings_instance
+    if _settings_instance is None:
+        _settings_instance = Settings()
+    return _settings_instance
@@ -1,62 +1,83 @@
 import asyncio
+import atexit
+import json
 import logging
 import os
+import queue
 import sys
+from logging.handlers import MemoryHandler, QueueHandler, QueueListener
 from aiohttp import web
 from bot.telegram_bot import TelegramBot
-from config.settings import Settings
+from config.settings import get_settings
+
+# /health is probed every few seconds by the hosting platform — serve one
+# pre-serialized body instead of rebuilding the dict and JSON per request.
+# The old per-request timestamp was monotonic loop time, meaningless to an
+# external probe, so it was dropped rather than recomputed.
+_HEALTH_BODY = json.dumps({
+    "status": "healthy",
+    "service": "Junghwan Telegram Bot",
+    "version": "2.0.0",
+}).encode()
 
 
 def setup_logging():
     log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
-    logging.basicConfig(
-        level=getattr(logging, log_level),
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(sys.stdout),
-            logging.FileHandler('bot.log', mode='a', encoding='utf-8')
-        ]
-    )
+    formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(formatter)
+    file_handler = logging.FileHandler('bot.log', mode='a', encoding='utf-8')
+    file_handler.setFormatter(formatter)
+    # FileHandler flushes on every record; buffering through MemoryHandler
+    # turns ~200 write syscalls into one. ERROR and above flush straight
+    # through, and logging.shutdown flushes the tail at exit.
+    buffered_file = MemoryHandler(capacity=200, flushLevel=logging.ERROR, target=file_handler)
+
+    # Handlers sit behind a queue drained by a background thread, so log
+    # calls on the event loop never wait on stdout or disk I/O
+    log_queue = queue.SimpleQueue()
+    listener = QueueListener(log_queue, stream_handler, buffered_file)
+    listener.start()
+    atexit.register(listener.stop)
+
+    root = logging.getLogger()
+    root.setLevel(getattr(logging, log_level))
+    root.addHandler(QueueHandler(log_queue))
+
     logging.getLogger('aiogram').setLevel(logging.WARNING)
     logging.getLogger('aiohttp').setLevel(logging.WARNING)
 
 
 async def health_check(request):
-    return web.json_response({
-        "status": "healthy",
-        "service": "Junghwan Telegram Bot",
-        "version": "2.0.0",
-        "timestamp": asyncio.get_event_loop().time()
-    })
+    return web.Response(body=_HEALTH_BODY, content_type="application/json")
 
 
 async def bot_info(request):
-    settings = Settings()
+    settings = request.app["settings"]
     return web.json_response({
         "bot_name": settings.BOT_NAME,
         "owner": settings.BOT_OWNER_NAME,
     })
 
 
-async def create_health_server():
+async def create_health_server(settings):
     app = web.Application()
+    app["settings"] = settings
     app.router.add_get('/health', health_check)
     app.router.add_get('/', health_check)
     app.router.add_get('/info', bot_info)
     port = int(os.getenv('PORT', 5000))
     runner = web.AppRunner(app)
     await runner.setup()
-    try:
-        site = web.TCPSite(runner, '0.0.0.0', port)
-        await site.start()
-        logging.info(f"Health server started on port {port}")
-        return runner
-    except OSError as e:
-        if e.errno == 98:
-            site = web.TCPSite(runner, '0.0.0.0', port + 1)
-            await site.start()
-            return runner
-        raise
+    # SO_REUSEADDR + SO_REUSEPORT up front: a restarting instance binds
+    # cleanly even while the old one is draining or in TIME_WAIT, so the
+    # old exception-driven fallback to port+1 (which the platform never
+    # probed anyway) is gone
+    site = web.TCPSite(runner, '0.0.0.0', port, reuse_address=True, reuse_port=True)
+    await site.start()
+    logging.info(f"Health server started on port {port}")
+    return runner
 
 
 async def main():
@@ -64,7 +85,7 @@ async def main():
     logger = logging.getLogger(__name__)
 
     try:
-        settings = Settings()
+        settings = get_settings()
         settings.validate()
 
         logger.info("Starting Junghwan Telegram Bot v2.0")
@@ -74,7 +95,7 @@ async def main():
         logger.info("Waiting 8s for previous instance to shut down...")
         await asyncio.sleep(8)
 
-        health_runner = await create_health_server()
+        health_runner = await create_health_server(settings)
 
         bot = TelegramBot(settings)
         try: